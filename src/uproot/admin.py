@@ -32,6 +32,7 @@ from uproot.services.auth import (
 # Re-export from config service
 from uproot.services.config_service import (
     announcements,
+    config_settings,
     config_summary,
     configs,
     displaystr,
@@ -51,6 +52,7 @@ from uproot.services.data_service import (
     generate_jsonl,
     is_custom_data_export,
     pipeline_result_display,
+    session_changed_since,
 )
 
 # Re-export from player service
@@ -93,6 +95,7 @@ from uproot.services.session_service import (
     PipelineInvocationError,
     flip_active,
     flip_testing,
+    forget_sessions,
     get_digest,
     get_pipelines,
     pipeline_call_kwargs,
@@ -124,6 +127,7 @@ __all__ = [
     "cleanup_expired_tokens",
     # Room
     "close_room",
+    "config_settings",
     "config_summary",
     "configs",
     "create_auth_token",
@@ -141,6 +145,7 @@ __all__ = [
     "fields_from_all",
     "flip_active",
     "flip_testing",
+    "forget_sessions",
     "from_cookie",
     "generate_briefcase",
     "generate_custom_csv",
@@ -176,6 +181,7 @@ __all__ = [
     "run_pipeline",
     "send_adminchat",
     "send_adminchat_to_players",
+    "session_changed_since",
     "session_exists",
     "sessions",
     "set_adminchat_replies",
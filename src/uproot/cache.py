@@ -5,6 +5,7 @@
 Compatibility layer that delegates to appendmuch Store.
 """
 
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any, Optional
 
 import appendmuch
@@ -39,6 +40,27 @@ def get_namespace(
     return None  # unreachable
 
 
+def latest_values(
+    namespace: tuple[str, ...],
+    fields: Sequence[str],
+) -> tuple[Any, ...]:
+    """Latest values of fields in a namespace (None if unset), read from the
+    history without a Storage context. They are not copied, so do not mutate
+    them."""
+    history = get_namespace(namespace) or {}
+    values = []
+
+    for field in fields:
+        hist = history.get(field)
+
+        if isinstance(hist, list) and hist and not hist[-1].unavailable:
+            values.append(hist[-1].data)
+        else:
+            values.append(None)
+
+    return tuple(values)
+
+
 def load_database_into_memory() -> None:
     if ensure_not_none(STORE):
         STORE.load()
@@ -197,12 +197,12 @@ def next_quick_roomname(roomnames: Collection[str]) -> str:
 
 
 def create_quick_room(config: str, simulate: bool) -> str:
-    import uproot as u
     import uproot.core as c
     import uproot.jobs as j
     import uproot.rooms as r
     from uproot.cache import load_database_into_memory
-    from uproot.storage import Admin, Session
+    from uproot.services.config_service import config_settings
+    from uproot.storage import Admin
 
     d.DATABASE.ensure()
     load_database_into_memory()
@@ -215,7 +215,9 @@ def create_quick_room(config: str, simulate: bool) -> str:
         sid = c.create_session(
             admin,
             config,
-            settings=u.CONFIGS_EXTRA.get(config, {}).get("settings", {}),
+            settings=config_settings(config),
+            room=roomname,
+            simulate=simulate,
         )
         admin.rooms[roomname] = r.room(
             roomname,
@@ -224,12 +226,6 @@ def create_quick_room(config: str, simulate: bool) -> str:
             sname=sid.sname,
         )
 
-    with Session(sid.sname) as session:
-        session.room = roomname
-
-        if simulate:
-            session._uproot_simulate = True
-
     r.start(roomname)
 
     return roomname
@@ -347,11 +343,17 @@ def announcements() -> None:
     import uproot as u
     from uproot.services import config_service
 
+    async def fetch() -> dict[str, Any]:
+        try:
+            return await config_service.announcements()
+        finally:
+            await config_service.close_http_client()
+
     httpx_logger = logging.getLogger("httpx")
     previous_level = httpx_logger.level
     httpx_logger.setLevel(logging.WARNING)
     try:
-        data = asyncio.run(config_service.announcements())
+        data = asyncio.run(fetch())
     finally:
         httpx_logger.setLevel(previous_level)
 
@@ -371,9 +373,12 @@ def announcements() -> None:
 @click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
 @click.pass_context
 def reset(ctx: click.Context, yes: bool) -> None:
+    from uproot.services.session_service import forget_sessions
+
     with confirmation("reset the database", ctx, yes):
         d.DATABASE.reset()
         d.DATABASE.close()
+        forget_sessions()
 
 
 # fmt: off
@@ -391,9 +396,12 @@ def dump(ctx: click.Context, file: str) -> None:
 @click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
 @click.pass_context
 def restore(ctx: click.Context, file: str, yes: bool) -> None:
+    from uproot.services.session_service import forget_sessions
+
     with confirmation("reset the database", ctx, yes):
         d.DATABASE.reset()
         d.DATABASE.close()
+        forget_sessions()
 
     with open(file, "rb") as f:
         d.DATABASE.restore(f)
@@ -5,6 +5,7 @@
 This file intends to provide (1) a simple replacement for raw `assert`s and (2) functions for commonly used constraints.
 """
 
+import re
 import string
 from collections.abc import Callable
 from typing import Any, TypeVar
@@ -13,17 +14,15 @@ from typing_extensions import TypeIs
 
 T = TypeVar("T")
 TOKEN_CHARS = set(string.ascii_letters + string.digits + "-._")
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9\-._]*")
+NON_TOKEN_PATTERN = re.compile(r"[^A-Za-z0-9\-._]")
 
 
 def valid_token(x: str) -> bool:
     if not isinstance(x, str):
         return False  # type: ignore[unreachable]
 
-    for ch in x:
-        if ch not in TOKEN_CHARS:
-            return False
-
-    return True
+    return TOKEN_PATTERN.fullmatch(x) is not None
 
 
 def return_or_raise(
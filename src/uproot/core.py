@@ -5,6 +5,7 @@
 # the Storage instance is "below" or "a member of" the entity being
 # created, initialized, and so on.
 
+import functools
 import importlib.metadata
 import sys
 from collections.abc import Iterable, Sequence
@@ -18,6 +19,17 @@ import uproot.types as t
 from uproot.constraints import ensure
 
 
+@functools.lru_cache(maxsize=1)
+def installed_packages() -> dict[str, str]:
+    """Installed distributions and their versions. The environment does not change
+    while the server runs, so site-packages is only walked once. Do not mutate the
+    returned dict."""
+    return {
+        dist.metadata["name"]: dist.version
+        for dist in importlib.metadata.distributions()
+    }
+
+
 def create_admin(admin: s.Storage) -> None:
     if not hasattr(admin, "_uproot_key"):
         admin._uproot_key = t.uuid()
@@ -36,6 +48,8 @@ def create_session(
     sname: t.Sessionname | None = None,
     check_unique: bool = True,
     settings: dict[str, Any] | None = None,
+    room: str | None = None,
+    simulate: bool = False,
 ) -> t.SessionIdentifier:
     ensure(
         settings is None or isinstance(settings, dict),
@@ -62,15 +76,12 @@ def create_session(
         session._uproot_groups = []
         session._uproot_models = []
         session._uproot_players = []
-        session.packages = {
-            dist.metadata["name"]: dist.version
-            for dist in importlib.metadata.distributions()
-        } | {"python": sys.version}
-        session.room = None
+        session.packages = installed_packages() | {"python": sys.version}
+        session.room = room
         session._uproot_settings = settings or {}
         session.sid = sid
         session._uproot_initialized = False
-        session._uproot_simulate = False
+        session._uproot_simulate = simulate
         session._uproot_testing = False
         session._uproot_secret = t.token_unchecked(8)
         session._uproot_session = t.identify(session)
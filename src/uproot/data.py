@@ -290,30 +290,57 @@ def value_cell(key: str) -> bool:
     return key == "!data" or not key.startswith("!")
 
 
-def csv_out(rows: Iterable[dict[str, Any]]) -> str:
-    rows = list(rows)
-
-    buffer = StringIO()
+def csv_fields(rows: Iterable[dict[str, Any]]) -> list[str]:
     csvfields: dict[str, None] = {}
 
     for row in rows:
         csvfields.update(dict.fromkeys(row.keys()))
 
-    sorted_fields = sorted(csvfields, key=column_order)
+    return sorted(csvfields, key=column_order)
+
+
+def csv_cells(row: dict[str, Any]) -> dict[str, str]:
+    unavailable = row.get("!unavailable", False)
+
+    return {
+        k: json2csv(value2json(v, unavailable and value_cell(k)))
+        for k, v in row.items()
+    }
+
+
+def csv_chunks(rows: Iterable[dict[str, Any]], chunk: int = 1000) -> Iterator[str]:
+    """Write rows as CSV, yielding the text every `chunk` rows."""
+    rows = list(rows)
 
-    dw = pycsv.DictWriter(buffer, fieldnames=sorted_fields)
+    buffer = StringIO()
+
+    dw = pycsv.DictWriter(buffer, fieldnames=csv_fields(rows))
     dw.writeheader()
 
-    for row in rows:
-        unavailable = row.get("!unavailable", False)
-        dw.writerow(
-            {
-                k: json2csv(value2json(v, unavailable and value_cell(k)))
-                for k, v in row.items()
-            }
-        )
+    for i, row in enumerate(rows, 1):
+        dw.writerow(csv_cells(row))
 
-    return buffer.getvalue()
+        if i % chunk == 0:
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+    if rest := buffer.getvalue():
+        yield rest
+
+
+def csv_out(rows: Iterable[dict[str, Any]]) -> str:
+    return "".join(csv_chunks(rows))
+
+
+async def csv_stream(
+    rows: Iterable[dict[str, Any]], chunk: int = 1000
+) -> AsyncGenerator[str, None]:
+    """Like csv_out(), but yields the CSV every `chunk` rows instead of holding
+    the entire body in memory."""
+    for part in csv_chunks(rows, chunk):
+        yield part
 
 
 def split_by_storage_kind(
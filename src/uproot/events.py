@@ -10,6 +10,8 @@ ATTENDANCE: defaultdict[Sessionname, BoundedPulse] = defaultdict(BoundedPulse)
 FIELDCHANGE: defaultdict[Sessionname, BoundedPulse] = defaultdict(BoundedPulse)
 ADMINCHAT: defaultdict[Sessionname, BoundedPulse] = defaultdict(BoundedPulse)
 ROOMS: defaultdict[str, Event] = defaultdict(Event)
+# Upper bound on the time of the latest change to any player of a session
+PLAYERS_CHANGED: dict[Sessionname, float] = {}
 
 
 def set_attendance(pid: PlayerIdentifier) -> None:
@@ -24,6 +26,9 @@ def set_fieldchange(
 ) -> None:
     sname = namespace[1]
 
+    if namespace[0] == "player" and value.time is not None:
+        PLAYERS_CHANGED[sname] = value.time
+
     FIELDCHANGE[sname].set((namespace, field, value))
 
 
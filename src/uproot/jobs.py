@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 import asyncio
-from collections.abc import Coroutine
+from collections.abc import Callable, Coroutine
 from typing import Any, cast
 from uuid import UUID
 
+import orjson
 from fastapi import FastAPI, WebSocket
 
 import uproot as u
@@ -15,6 +16,7 @@ import uproot.events as e
 import uproot.queues as q
 import uproot.storage as s
 from uproot.constraints import ensure
+from uproot.services.auth import cleanup_expired_tokens
 from uproot.types import (
     PlayerIdentifier,
     Sessionname,
@@ -31,7 +33,7 @@ async def from_queue(queue: q.QueueType) -> tuple[UUID, q.EntryType]:
 
 
 async def from_websocket(websocket: WebSocket) -> dict[str, Any]:
-    return cast(dict[str, Any], await websocket.receive_json())
+    return cast(dict[str, Any], orjson.loads(await websocket.receive_text()))
 
 
 async def subscribe_to_attendance(
@@ -69,6 +71,31 @@ async def timer(interval: float) -> None:
     await asyncio.sleep(interval)
 
 
+async def forward(
+    fname: str,
+    job: Callable[[], Coroutine[Any, Any, Any]],
+    queue: asyncio.Queue[tuple[str, Any]],
+    once: bool = False,
+) -> None:
+    """Run a job repeatedly and put each outcome on a shared queue.
+
+    ``job`` is a zero-argument callable returning a fresh coroutine. A raised
+    exception is put on the queue in place of a result and ends the loop, so
+    that the consumer handles both in the same place.
+    """
+    while True:
+        try:
+            result = await job()
+        except Exception as exc:  # noqa: BLE001
+            await queue.put((fname, exc))
+            return
+
+        await queue.put((fname, result))
+
+        if once:
+            return
+
+
 BACKGROUND_TASKS: set[asyncio.Task[Any]] = set()
 
 
@@ -149,6 +176,16 @@ async def dropout_watcher(app: FastAPI, interval: float = 3.0) -> None:
         await asyncio.sleep(interval)
 
 
+async def token_sweeper(app: FastAPI, interval: float = 3600.0) -> None:
+    while True:
+        try:
+            cleanup_expired_tokens()
+        except Exception:  # noqa: BLE001
+            d.LOGGER.exception("Exception in token sweeper")
+
+        await asyncio.sleep(interval)
+
+
 def synchronize_rooms(admin: s.Storage) -> None:
     if not hasattr(admin, "rooms"):
         admin.rooms = {}
@@ -246,21 +283,22 @@ def try_group(player: s.Storage, show_page: int, group_size: int) -> str | None:
 
 GLOBAL_JOBS = [
     dropout_watcher,
+    token_sweeper,
 ]
 
 
-ADMIN_JOBS = [
+ADMIN_JOBS: list[Callable[..., Coroutine[Any, Any, Any]]] = [
     from_websocket,
     timer,
 ]
 
-PLAYER_JOBS = [
+PLAYER_JOBS: list[Callable[..., Coroutine[Any, Any, Any]]] = [
     from_queue,
     from_websocket,
     timer,
 ]
 
-ROOM_JOBS = [
+ROOM_JOBS: list[Callable[..., Coroutine[Any, Any, Any]]] = [
     subscribe_to_room,
     from_websocket,
     timer,
@@ -87,6 +87,29 @@ def enqueue(path: PathType, entry: EntryType) -> tuple[PathType, UUID]:
     Returns:
         A tuple of the path and the UUID assigned to the entry.
     """
+    return deliver(path, entry)
+
+
+@validate_call
+def enqueue_many(
+    paths: list[PathType], entry: EntryType
+) -> list[tuple[PathType, UUID]]:
+    """
+    Enqueue the same entry for every path in paths, like enqueue(path, entry)
+    for each of them. The entry is validated once and shared by all consumers,
+    which only ever read entries. Every path gets its own UUID.
+
+    Args:
+        paths: Tuples of strings identifying the queues.
+        entry: The entry to enqueue.
+
+    Returns:
+        A list of tuples of each path and the UUID assigned to its entry.
+    """
+    return [deliver(path, entry) for path in paths]
+
+
+def deliver(path: PathType, entry: EntryType) -> tuple[PathType, UUID]:
     u = uuid()
 
     for queue in tuple(Q.get(path, ())):
@@ -26,7 +26,7 @@ State 1:
 from typing import Any, TypeAlias
 
 import uproot.events as e
-from uproot.constraints import TOKEN_CHARS, return_or_raise, valid_token
+from uproot.constraints import NON_TOKEN_PATTERN, return_or_raise, valid_token
 from uproot.types import Sessionname
 
 RoomType: TypeAlias = dict[str, Any]
@@ -76,21 +76,7 @@ def constrain_label(label: Any) -> str:
     if not isinstance(label, str):
         return ""
 
-    if valid_token(label[:128]):
-        return label[:128]
-
-    newlabel = ""
-
-    for ch in label:
-        if ch in TOKEN_CHARS:
-            newlabel += ch
-        else:
-            newlabel += "_"
-
-        if len(newlabel) >= 128:
-            break
-
-    return newlabel
+    return NON_TOKEN_PATTERN.sub("_", label[:128])
 
 
 def validate(room: RoomType, label: str) -> bool:
@@ -30,6 +30,7 @@ from uproot.server2 import router as router2
 from uproot.server3 import router as router3
 from uproot.server4 import router as router4
 from uproot.services.auth import admin_password_salt, hash_admin_password
+from uproot.services.config_service import close_http_client, configs
 from uproot.storage import Admin
 from uproot.types import (
     ensure_awaitable,
@@ -222,6 +223,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[Never]:
         u.APPS.stop_watching()
 
     await asyncio.gather(*tasks)
+    await close_http_client()
 
 
 uproot_server = FastAPI(
@@ -264,7 +266,7 @@ def load_config(
     ensure(not config.startswith("~"), ValueError, "Config path cannot start with '~'")
 
     if not hasattr(u, "APPS"):
-        u.APPS = ModuleManager()
+        u.APPS = ModuleManager(hook=lambda module: configs.cache_clear())
 
     u.CONFIGS[config] = []
     u.CONFIGS_EXTRA[config] = {
@@ -297,3 +299,5 @@ def load_config(
             suggested = math.lcm(suggested, sm)
 
     u.CONFIGS_EXTRA[config]["suggested_multiple"] = suggested
+
+    configs.cache_clear()
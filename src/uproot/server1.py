@@ -31,7 +31,6 @@ from fastapi import (
 )
 from fastapi.responses import (
     HTMLResponse,
-    JSONResponse,
     RedirectResponse,
     Response,
 )
@@ -787,11 +786,13 @@ async def ws(
                 }
             )
 
-    for jj in j.PLAYER_JOBS:
-        tasks[asyncio.create_task(cast(Any, jj)(**args[jj.__name__]))] = (
-            jj.__name__,
-            jj,
-        )
+    # Bind each job's arguments once so that recreating a task is a plain call
+    factories = {
+        jj.__name__: functools.partial(jj, **args[jj.__name__]) for jj in j.PLAYER_JOBS
+    }
+
+    for fname, factory in factories.items():
+        tasks[asyncio.create_task(factory())] = fname
 
     async def cleanup_tasks() -> None:
         nonlocal cleanup_complete
@@ -825,15 +826,13 @@ async def ws(
             )[0]
 
             for finished in done:
-                fname, factory = tasks.pop(finished)
+                fname = tasks.pop(finished)
                 try:
                     result = await finished
 
                     if fname == "from_websocket":
-                        new_task = asyncio.create_task(
-                            cast(Any, factory)(**args[fname])
-                        )
-                        tasks[new_task] = (fname, factory)
+                        new_task = asyncio.create_task(factories[fname]())
+                        tasks[new_task] = fname
 
                     if fname == "from_queue":
                         u_, entry = result
@@ -876,8 +875,8 @@ async def ws(
                     return
 
                 if fname != "from_websocket":
-                    new_task = asyncio.create_task(cast(Any, factory)(**args[fname]))
-                    tasks[new_task] = (fname, factory)
+                    new_task = asyncio.create_task(factories[fname]())
+                    tasks[new_task] = fname
     finally:
         await cleanup_tasks()
 
@@ -958,7 +957,10 @@ async def app_queries(
         if isinstance(result, Response):
             return result
         else:
-            return JSONResponse(result)
+            return Response(
+                orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS),
+                media_type="application/json",
+            )
 
 
 @router.get("/api2/{appname}/{sname}/")
@@ -986,4 +988,7 @@ async def app_queries2(
         if isinstance(result, Response):
             return result
         else:
-            return JSONResponse(result)
+            return Response(
+                orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS),
+                media_type="application/json",
+            )
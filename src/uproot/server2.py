@@ -7,7 +7,6 @@ This file implements admin routes.
 
 import asyncio
 import hmac
-import importlib.metadata
 import os
 import sys
 from datetime import UTC, datetime
@@ -153,7 +152,7 @@ async def render_session_settings_forms() -> (
 
     for config, apps in u.CONFIGS.items():
         rendered = []
-        settings = u.CONFIGS_EXTRA.get(config, {}).get("settings", {})
+        settings = a.config_settings(config)
 
         try:
             ensure(
@@ -196,11 +195,7 @@ async def render_session_settings_forms() -> (
 
 
 def parse_session_settings(settings: str, config: str) -> dict[str, Any]:
-    parsed = (
-        orjson.loads(settings)
-        if settings.strip()
-        else u.CONFIGS_EXTRA.get(config, {}).get("settings", {})
-    )
+    parsed = orjson.loads(settings) if settings.strip() else a.config_settings(config)
     ensure(
         isinstance(parsed, dict),
         TypeError,
@@ -286,9 +281,7 @@ async def ws(websocket: WebSocket, uauth: str | None = Cookie(None)) -> None:
     }
 
     for jj in j.ADMIN_JOBS:
-        fun = cast(Any, jj)
-
-        tasks[asyncio.create_task(fun(**args[jj.__name__]))] = jj.__name__, jj
+        tasks[asyncio.create_task(jj(**args[jj.__name__]))] = jj.__name__, jj
 
     async def cleanup_tasks() -> None:
         for task in tasks:
@@ -515,7 +508,7 @@ async def ws(websocket: WebSocket, uauth: str | None = Cookie(None)) -> None:
 
             # Re-add new instance of the same task (except one-shot tasks)
             if fname != "subscribe_to_room":
-                new_task = asyncio.create_task(cast(Any, factory)(**args[fname]))
+                new_task = asyncio.create_task(factory(**args[fname]))
                 tasks[new_task] = (fname, factory)
 
 
@@ -871,6 +864,8 @@ async def new_session_in_room(
             config,
             sname=sname_,
             settings=settings_parsed,
+            room=roomname,
+            simulate=bool(simulate),
         )
 
         admin.rooms[roomname]["sname"] = sid.sname
@@ -880,11 +875,6 @@ async def new_session_in_room(
             admin.rooms[roomname]["capacity"] = nplayers
 
     with t.materialize(sid) as session:
-        session.room = roomname
-
-        if simulate:
-            session._uproot_simulate = True
-
         c.create_players(
             session,
             n=nplayers,
@@ -1017,12 +1007,10 @@ async def new_session2(
             config,
             sname=sname_,
             settings=settings_parsed,
+            simulate=bool(simulate),
         )
 
     with t.materialize(sid) as session:
-        if simulate:
-            session._uproot_simulate = True
-
         c.create_players(
             session,
             n=nplayers,
@@ -1241,7 +1229,7 @@ async def session_pipeline_run(
     )
 
     if filetype == "csv":
-        return Response(
+        return StreamingResponse(
             a.generate_custom_csv(rows),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}.csv"},
@@ -1270,7 +1258,7 @@ async def session_data_download(
     stamp = datetime.now(UTC).strftime("%Y-%m-%d_%H%M")
 
     t0 = now()
-    briefcase = a.generate_briefcase(sname, gvar, filters, filetype)
+    briefcase = await a.generate_briefcase(sname, gvar, filters, filetype)
 
     d.LOGGER.debug(
         "generate_briefcase took %.5f seconds",
@@ -1371,12 +1359,7 @@ async def status(
                     "nudge_announcements": nudge_announcements(),
                 },
                 {
-                    "packages": SortedDict(
-                        {
-                            dist.metadata["name"]: dist.version
-                            for dist in importlib.metadata.distributions()
-                        }
-                    ).items(),
+                    "packages": SortedDict(c.installed_packages()).items(),
                 },
             )
         )
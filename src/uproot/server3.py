@@ -6,7 +6,9 @@ This file implements room routes.
 """
 
 import asyncio
-from typing import Any, cast
+from collections.abc import Callable, Coroutine
+from functools import partial
+from typing import Any
 from urllib.parse import quote
 
 import orjson
@@ -29,11 +31,24 @@ import uproot.types as t
 from uproot.constraints import ensure, valid_token
 from uproot.pages import path2page, render
 from uproot.security import require_same_origin_websocket
-from uproot.storage import Admin, Player, Session
+from uproot.services.config_service import config_settings
+from uproot.storage import Admin, Session
 from uproot.utils import safe_redirect_response
 
 router = APIRouter(prefix=d.ROOT)
 
+# The heartbeat reply only varies in its future, so the envelope is kept
+# pre-serialized
+HELLO_PREFIX = b'{"kind":"invoke","payload":{"future":'
+HELLO_SUFFIX = b',"error":false,"data":null}}'
+
+ROOM_HELLO = path2page("RoomHello.html")
+ROOM_FULL = path2page("RoomFull.html")
+
+
+class RoomLeft(Exception):
+    """Raised to close the task group of a room websocket."""
+
 
 @router.get("/room/{roomname}")
 async def room_without_terminating_slash(
@@ -56,9 +71,9 @@ async def roommain(
 
     new_session = False
 
-    with Admin() as admin:
-        label = ur.constrain_label(label)
+    label = ur.constrain_label(label)
 
+    with Admin() as admin:
         if roomname not in admin.rooms:
             raise HTTPException(status_code=404)
 
@@ -67,66 +82,46 @@ async def roommain(
 
         # Handle label entry for rooms that require labels
 
-        if needs_label:
-            if label == "":
-                return HTMLResponse(
-                    await render(
-                        request.app,
-                        request,
-                        None,
-                        path2page("RoomHello.html"),
-                        metadata={
-                            "roomname": roomname,
-                            "needlabel": True,
-                            "bad": False,
-                        },
-                    ),
-                )
-            elif not ur.validate(room, label):
-                return HTMLResponse(
-                    await render(
-                        request.app,
-                        request,
-                        None,
-                        path2page("RoomHello.html"),
-                        metadata={"roomname": roomname, "needlabel": True, "bad": True},
-                    ),
-                )
+        hello: dict[str, Any] | None = None
+
+        if needs_label and (label == "" or not ur.validate(room, label)):
+            hello = {"roomname": roomname, "needlabel": True, "bad": label != ""}
 
         # Room not open - show waiting page. This must be checked regardless
         # of whether a session is already associated: admins can close a room
         # without disassociating its session (see set_room_open), and a closed
         # room must never admit new players.
 
-        if not room["open"] or (room["sname"] is None and room["config"] is None):
-            return HTMLResponse(
-                await render(
-                    request.app,
-                    request,
-                    None,
-                    path2page("RoomHello.html"),
-                    metadata={"roomname": roomname, "needlabel": False, "label": label},
-                ),
-            )
+        elif not room["open"] or (room["sname"] is None and room["config"] is None):
+            hello = {"roomname": roomname, "needlabel": False, "label": label}
 
         # Room is ready - attempt to join
 
-        capacity = 0
-
-        if room["capacity"] is not None:
-            capacity = room["capacity"]
-        elif room["labels"] is not None:
-            capacity = len(room["labels"])
-
-        if room["sname"] is None:
+        if hello is None and room["sname"] is None:
             sid = c.create_session(
                 admin,
                 room["config"],
-                settings=u.CONFIGS_EXTRA.get(room["config"], {}).get("settings", {}),
+                settings=config_settings(room["config"]),
+                room=roomname,
             )
             room["sname"] = sid.sname
             new_session = True
 
+    # Rendering happens after the admin context has been left so that it is
+    # not held open across the await
+
+    if hello is not None:
+        return HTMLResponse(
+            await render(request.app, request, None, ROOM_HELLO, metadata=hello),
+        )
+
+    capacity = 0
+
+    if room["capacity"] is not None:
+        capacity = room["capacity"]
+    elif room["labels"] is not None:
+        capacity = len(room["labels"])
+
     session = Session(room["sname"])
 
     # Try to add new player. The label-dedupe scan and the add must share a
@@ -135,43 +130,30 @@ async def roommain(
     # create a new player for that label.
 
     with session:
-        if new_session:
-            session.room = roomname
-
-        if label != "":
-            for pid in session._uproot_players:
-                with Player(pid.sname, pid.uname) as player:
-                    if hasattr(player, "label") and player.label == label:
-                        return RedirectResponse(
-                            f"{d.ROOT}/p/{pid.sname}/{pid.uname}/", status_code=303
-                        )
-
-        free_slot = c.find_free_slot(session)
+        players = session._uproot_players
 
-        if (
-            ur.freejoin(room)
-            or len(session._uproot_players) < capacity
-            or free_slot is not None
-        ):
-            sname = room["sname"]
+        # Labels are immutable strings, so they can be read without entering
+        # a context for every player
 
-            if free_slot is not None:
-                _, free_uname = free_slot
+        if label != "" and players:
+            for pid in players:
+                if t.materialize(pid).get("label") == label:
+                    return RedirectResponse(
+                        f"{d.ROOT}/p/{pid.sname}/{pid.uname}/", status_code=303
+                    )
 
-                # Redirect to player
-                with Player(sname, free_uname) as player:
-                    player.started = True
-                    player.label = label
+        free_slot = c.find_free_slot(session)
 
-                redirect_to = f"{d.ROOT}/p/{sname}/{free_uname}/"
-            else:
-                pid = c.create_player(session)
+        if ur.freejoin(room) or len(players) < capacity or free_slot is not None:
+            pid = free_slot if free_slot is not None else c.create_player(session)
 
-                with t.materialize(pid) as player:
-                    player.started = True
-                    player.label = label
+            # Both fields are immutable, so they are written straight through
+            # without a player context
+            player = t.materialize(pid)
+            player.started = True
+            player.label = label
 
-                redirect_to = f"{d.ROOT}/p/{sname}/{pid.uname}/"
+            redirect_to = f"{d.ROOT}/p/{pid.sname}/{pid.uname}/"
 
             if new_session:
                 ur.start(roomname)
@@ -183,7 +165,7 @@ async def roommain(
                     request.app,
                     request,
                     None,
-                    path2page("RoomFull.html"),
+                    ROOM_FULL,
                     metadata={"called_from": "room"},
                 ),
                 status_code=423,
@@ -198,10 +180,13 @@ async def ws(
 ) -> None:
     require_same_origin_websocket(websocket)
 
+    if not valid_token(roomname):
+        return
+
     label = ur.constrain_label(label)
 
     with Admin() as admin:
-        if not valid_token(roomname) or roomname not in admin.rooms:
+        if roomname not in admin.rooms:
             return
 
         room = admin.rooms[roomname]
@@ -220,104 +205,94 @@ async def ws(
     await websocket.accept()
 
     pid = t.PlayerIdentifier(f"^{roomname}", local_context)
-    tasks = {}
-    args: dict[str, dict[str, Any]] = {
-        "from_websocket": {
-            "websocket": websocket,
-        },
-        "subscribe_to_room": {
-            "roomname": roomname,
-        },
-        "timer": {
-            "interval": 30.0,
-        },
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+    factories: dict[str, Callable[[], Coroutine[Any, Any, Any]]] = {
+        "from_websocket": partial(j.from_websocket, websocket=websocket),
+        "subscribe_to_room": partial(j.subscribe_to_room, roomname=roomname),
+        "timer": partial(j.timer, interval=30.0),
     }
 
-    for jj in j.ROOM_JOBS:
-        tasks[asyncio.create_task(cast(Any, jj)(**args[jj.__name__]))] = (
-            jj.__name__,
-            jj,
-        )
-
-    async def cleanup_tasks() -> None:
-        for task in tasks:
-            task.cancel()
-
-        await asyncio.gather(*tasks.keys(), return_exceptions=True)
-
-    while True:
-        done, _ = await asyncio.wait(tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
+    # One long-lived task per job feeds the queue (subscribe_to_room is
+    # one-shot), so the loop below never has to recreate tasks. Leaving the
+    # task group via RoomLeft cancels all of them.
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for jj in j.ROOM_JOBS:
+                fname = jj.__name__
+
+                tg.create_task(
+                    j.forward(
+                        fname,
+                        factories[fname],
+                        queue,
+                        once=fname == "subscribe_to_room",
+                    )
+                )
 
-        for finished in done:
-            fname, factory = tasks.pop(finished)
+            while True:
+                fname, result = await queue.get()
 
-            try:
-                result = await finished
+                try:
+                    if isinstance(result, Exception):
+                        raise result
 
-                if fname == "from_websocket":
-                    u.set_online(pid)
+                    if fname == "from_websocket":
+                        u.set_online(pid)
 
-                    await websocket.send_bytes(
-                        orjson.dumps(
-                            {
-                                "kind": "event",
-                                "payload": {
-                                    "event": "RoomLabelProvided",
-                                    "detail": {
-                                        "label": local_context,
+                        await websocket.send_bytes(
+                            orjson.dumps(
+                                {
+                                    "kind": "event",
+                                    "payload": {
+                                        "event": "RoomLabelProvided",
+                                        "detail": {
+                                            "label": local_context,
+                                        },
                                     },
-                                },
-                            }
+                                }
+                            )
                         )
-                    )
 
-                    # Handle hello endpoint for heartbeat
-                    if isinstance(result, dict) and result.get("endpoint") == "hello":
-                        # Respond to hello to maintain heartbeat
+                        # Handle hello endpoint for heartbeat
+                        if (
+                            isinstance(result, dict)
+                            and result.get("endpoint") == "hello"
+                        ):
+                            # Respond to hello to maintain heartbeat
+                            await websocket.send_bytes(
+                                HELLO_PREFIX
+                                + orjson.dumps(result.get("future"))
+                                + HELLO_SUFFIX
+                            )
+                        # Otherwise ignore messages (for now)
+                    elif fname == "subscribe_to_room":
                         await websocket.send_bytes(
                             orjson.dumps(
                                 {
-                                    "kind": "invoke",
+                                    "kind": "event",
                                     "payload": {
-                                        "future": result.get("future"),
-                                        "error": False,
-                                        "data": None,
+                                        "event": "RoomStarted",
+                                        "detail": {
+                                            "label": local_context,
+                                        },
                                     },
                                 }
                             )
                         )
-                    # Otherwise ignore messages (for now)
-                elif fname == "subscribe_to_room":
-                    await websocket.send_bytes(
-                        orjson.dumps(
-                            {
-                                "kind": "event",
-                                "payload": {
-                                    "event": "RoomStarted",
-                                    "detail": {
-                                        "label": local_context,
-                                    },
-                                },
-                            }
-                        )
-                    )
-                elif fname == "timer":
-                    pass  # Placeholder for the future
-                else:
-                    raise NotImplementedError(fname)
-            except WebSocketDisconnect:
-                # Unlike the main ws, this really means the person went away
-                u.set_offline(pid)
-
-                await cleanup_tasks()
-                return
-            except Exception:  # noqa: BLE001
-                d.LOGGER.exception("Closing room websocket after handler failure")
-                u.set_offline(pid)
-                await cleanup_tasks()
-                return
-
-            # Re-add new instance of the same task (except one-shot tasks)
-            if fname != "subscribe_to_room":
-                new_task = asyncio.create_task(cast(Any, factory)(**args[fname]))
-                tasks[new_task] = (fname, factory)
+                    elif fname == "timer":
+                        pass  # Placeholder for the future
+                    else:
+                        raise NotImplementedError(fname)
+                except WebSocketDisconnect:
+                    # Unlike the main ws, this really means the person went away
+                    u.set_offline(pid)
+
+                    raise RoomLeft
+                except Exception:  # noqa: BLE001
+                    d.LOGGER.exception("Closing room websocket after handler failure")
+                    u.set_offline(pid)
+
+                    raise RoomLeft
+    except* RoomLeft:
+        pass
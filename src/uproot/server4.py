@@ -9,10 +9,9 @@ Tokens are configured in deployment.API_KEYS.
 """
 
 import hmac
-import importlib.metadata
 import sys
 from pathlib import Path
-from typing import Any, TypeAlias
+from typing import Annotated, Any, Literal, TypeAlias
 
 import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
@@ -22,7 +21,7 @@ from fastapi.responses import (
     Response,
     StreamingResponse,
 )
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
 
 import uproot as u
 import uproot.admin as a
@@ -38,6 +37,7 @@ from uproot.storage import Admin, Session, Storage
 
 router = APIRouter(prefix=f"{d.ROOT}/admin/api/v1")
 Session_: TypeAlias = Storage
+ExportFormat: TypeAlias = Literal["ultralong", "sparse", "latest"]
 DefaultPlayerFieldsQuery = Query(
     default=["id", "page_order", "show_page", "started", "label"]
 )
@@ -45,6 +45,9 @@ GroupedExportVariablesQuery = Query(
     default=[],
     description="Group-by variables for the optional grouped latest format",
 )
+JsonlFormatQuery = Query(
+    default="ultralong", description="Export format: ultralong, sparse, or latest"
+)
 JsonlGroupVariablesQuery = Query(default=[], description="Group-by variables")
 
 # =============================================================================
@@ -52,7 +55,21 @@ JsonlGroupVariablesQuery = Query(default=[], description="Group-by variables")
 # =============================================================================
 
 
-class SessionCreate(BaseModel):
+def unique(values: list[str]) -> list[str]:
+    return list(dict.fromkeys(values))
+
+
+# Players named twice in one request would be acted on twice
+Usernames: TypeAlias = Annotated[list[str], AfterValidator(unique)]
+
+
+class APIModel(BaseModel):
+    """Base for request bodies: unknown fields are rejected, bodies are read-only."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class SessionCreate(APIModel):
     """Request body for creating a new session."""
 
     config: str = Field(..., description="Configuration name")
@@ -65,7 +82,7 @@ class SessionCreate(BaseModel):
     simulate: bool = Field(False, description="Enable response simulation")
 
 
-class RoomCreate(BaseModel):
+class RoomCreate(APIModel):
     """Request body for creating a new room."""
 
     name: str = Field(..., min_length=1, description="Room name")
@@ -84,46 +101,48 @@ class RoomCreate(BaseModel):
     sname: str | None = Field(None, description="Associated session name")
 
 
-class PlayersAction(BaseModel):
+class PlayersAction(APIModel):
     """Request body for player actions (advance, revert, etc.)."""
 
-    unames: list[str] = Field(
+    unames: Usernames = Field(
         ..., min_length=1, description="List of usernames to act on"
     )
 
 
-class PlayersFields(BaseModel):
+class PlayersFields(APIModel):
     """Request body for inserting fields on players."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     fields: dict[str, Any] = Field(..., description="Fields to set")
     reload: bool = Field(False, description="Whether to trigger page reload")
 
 
-class PlayerRedirect(BaseModel):
+class PlayerRedirect(APIModel):
     """Request body for redirecting players."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     url: str = Field(
-        ..., description="URL to redirect to (must start with http:// or https://)"
+        ...,
+        pattern=r"^https?://",
+        description="URL to redirect to (must start with http:// or https://)",
     )
 
 
-class PlayerTimeout(BaseModel):
+class PlayerTimeout(APIModel):
     """Request body for adjusting player timeouts."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     delta: float = Field(60.0, description="Timeout adjustment in seconds")
 
 
-class PlayerMessage(BaseModel):
+class PlayerMessage(APIModel):
     """Request body for sending admin messages to players."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     message: str = Field(..., description="Message to send")
 
 
-class AdminchatMessage(BaseModel):
+class AdminchatMessage(APIModel):
     """Request body for sending an admin chat message to one player."""
 
     message: str = Field(..., description="Message to send")
@@ -133,10 +152,10 @@ class AdminchatMessage(BaseModel):
     )
 
 
-class AdminchatBroadcast(BaseModel):
+class AdminchatBroadcast(APIModel):
     """Request body for sending an admin chat message to multiple players."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     message: str = Field(..., description="Message to send")
     enable_replies: bool | None = Field(
         None,
@@ -144,30 +163,32 @@ class AdminchatBroadcast(BaseModel):
     )
 
 
-class AdminchatReplies(BaseModel):
+class AdminchatReplies(APIModel):
     """Request body for toggling player reply permission."""
 
     enabled: bool = Field(..., description="Whether player replies are enabled")
 
 
-class DescriptionUpdate(BaseModel):
+class DescriptionUpdate(APIModel):
     """Request body for updating session description."""
 
     description: str = Field("", description="New description (empty to clear)")
 
 
-class SettingsUpdate(BaseModel):
+class SettingsUpdate(APIModel):
     """Request body for updating session settings."""
 
     settings: dict[str, Any] = Field(..., description="New settings")
 
 
-class RoomSessionCreate(BaseModel):
+class RoomSessionCreate(APIModel):
     """Request body for creating a session within a room."""
 
     config: str = Field(..., description="Configuration name")
     n_players: int = Field(..., ge=0, description="Number of players")
-    assignees: list[str] | None = Field(None, description="Labels to assign to players")
+    assignees: list[str] = Field(
+        default_factory=list, description="Labels to assign to players"
+    )
     settings: dict[str, Any] | None = Field(None, description="Session settings")
     sname: str | None = Field(None, description="Custom session name")
     unames: list[str] | None = Field(None, description="Custom usernames")
@@ -175,7 +196,7 @@ class RoomSessionCreate(BaseModel):
     simulate: bool = Field(False, description="Enable response simulation")
 
 
-class RoomUpdate(BaseModel):
+class RoomUpdate(APIModel):
     """Request body for updating room settings."""
 
     config: str | None = Field(None, description="Default configuration")
@@ -193,13 +214,13 @@ class RoomUpdate(BaseModel):
     )
 
 
-class RoomOpen(BaseModel):
+class RoomOpen(APIModel):
     """Request body for setting a room's open status."""
 
     open: bool = Field(..., description="Whether the room should be open")
 
 
-class RoomCapacity(BaseModel):
+class RoomCapacity(APIModel):
     """Request body for setting a room's capacity."""
 
     capacity: int | None = Field(
@@ -207,7 +228,7 @@ class RoomCapacity(BaseModel):
     )
 
 
-class RoomClose(BaseModel):
+class RoomClose(APIModel):
     """Request body for closing a room."""
 
     disassociate: bool = Field(
@@ -216,10 +237,10 @@ class RoomClose(BaseModel):
     )
 
 
-class PlayersGroup(BaseModel):
+class PlayersGroup(APIModel):
     """Request body for grouping player actions."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     action: str = Field(
         ...,
         description="Grouping action: same_group, reset, or by_size",
@@ -229,14 +250,14 @@ class PlayersGroup(BaseModel):
     reload: bool = Field(False, description="Whether to trigger page reload")
 
 
-class PlayersChatReplies(BaseModel):
+class PlayersChatReplies(APIModel):
     """Request body for toggling admin chat replies for multiple players."""
 
-    unames: list[str] = Field(..., min_length=1, description="List of usernames")
+    unames: Usernames = Field(..., min_length=1, description="List of usernames")
     enabled: bool = Field(..., description="Whether player replies are enabled")
 
 
-class AuthLogin(BaseModel):
+class AuthLogin(APIModel):
     """Request body for creating the same browser admin session as /admin/login/."""
 
     user: str = Field("admin", description="Admin username")
@@ -246,7 +267,7 @@ class AuthLogin(BaseModel):
     pow_solution: str = Field("", description="Proof-of-work solution")
 
 
-class AuthToken(BaseModel):
+class AuthToken(APIModel):
     """Request body naming a browser admin auth token."""
 
     auth_token: str = Field(..., description="Value of the uauth browser cookie")
@@ -265,8 +286,8 @@ def ensure_unames_count(n_players: int, unames: list[str] | None) -> None:
         )
 
 
-def ensure_assignees_count(n_players: int, assignees: list[str] | None) -> None:
-    if assignees is not None and len(assignees) > n_players:
+def ensure_assignees_count(n_players: int, assignees: list[str]) -> None:
+    if len(assignees) > n_players:
         raise HTTPException(
             status_code=400,
             detail="Number of assignees cannot exceed n_players",
@@ -391,14 +412,7 @@ def missing_i18n_terms() -> dict[str, list[str]]:
     return missing
 
 
-def valid_export_format(format: str) -> None:
-    if format not in ("ultralong", "sparse", "latest"):
-        raise HTTPException(
-            status_code=400, detail="Invalid format. Use: ultralong, sparse, or latest"
-        )
-
-
-def briefcase_export_response(
+async def briefcase_export_response(
     sname: str,
     gvar: list[str],
     filters: bool,
@@ -410,7 +424,7 @@ def briefcase_export_response(
         )
 
     return Response(
-        a.generate_briefcase(sname, gvar, filters, filetype),
+        await a.generate_briefcase(sname, gvar, filters, filetype),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={sname}.zip"},
     )
@@ -418,12 +432,10 @@ def briefcase_export_response(
 
 def jsonl_export_response(
     sname: str,
-    format: str,
+    format: ExportFormat,
     gvar: list[str],
     filters: bool,
 ) -> StreamingResponse:
-    valid_export_format(format)
-
     return StreamingResponse(
         a.generate_jsonl(sname, format, gvar, filters),
         media_type="application/jsonl",
@@ -514,9 +526,7 @@ async def create_session(
     ensure_unames_count(body.n_players, body.unames)
 
     settings_parsed = (
-        body.settings
-        if body.settings is not None
-        else u.CONFIGS_EXTRA.get(body.config, {}).get("settings", {})
+        body.settings if body.settings is not None else a.config_settings(body.config)
     )
 
     with Admin() as admin:
@@ -528,12 +538,10 @@ async def create_session(
             body.config,
             sname=body.sname,
             settings=settings_parsed,
+            simulate=body.simulate,
         )
 
     with t.materialize(sid) as session:
-        if body.simulate:
-            session._uproot_simulate = True
-
         c.create_players(
             session,
             n=body.n_players,
@@ -550,10 +558,8 @@ async def toggle_session_active(
 ) -> dict[str, Any]:
     """Toggle the active status of a session."""
     a.session_exists(sname)
-    await a.flip_active(sname)
 
-    with Session(sname) as session:
-        return {"active": session.active}
+    return {"active": await a.flip_active(sname)}
 
 
 @router.patch("/sessions/{sname}/testing/")
@@ -563,10 +569,8 @@ async def toggle_session_testing(
 ) -> dict[str, Any]:
     """Toggle the testing mode of a session."""
     a.session_exists(sname)
-    await a.flip_testing(sname)
 
-    with Session(sname) as session:
-        return {"testing": session._uproot_testing}
+    return {"testing": await a.flip_testing(sname)}
 
 
 @router.post("/sessions/{sname}/initialize/")
@@ -578,8 +582,7 @@ async def initialize_session(
     a.session_exists(sname)
     await a.run_new_session(sname)
 
-    with Session(sname) as session:
-        return {"initialized": session._uproot_initialized}
+    return {"initialized": Session(sname)._uproot_initialized}
 
 
 @router.patch("/sessions/{sname}/description/")
@@ -747,10 +750,7 @@ async def redirect_players(
     """Redirect specified players to an external URL."""
     a.session_exists(sname)
 
-    try:
-        await a.redirect(sname, body.unames, body.url)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    await a.redirect(sname, body.unames, body.url)
 
     return {"redirected": body.unames, "url": body.url}
 
@@ -902,8 +902,15 @@ async def get_session_data(
     ),
     bauth: None = Depends(a.require_bearer_token),
 ) -> dict[str, Any]:
-    """Get all session data in display format, optionally filtered by timestamp."""
+    """Get all session data in display format, optionally filtered by timestamp.
+
+    Responds with 304 Not Modified if no player data has changed since then.
+    """
     a.session_exists(sname)
+
+    if not a.session_changed_since(sname, since):
+        raise HTTPException(status_code=304)
+
     data, last_update = await a.everything_from_session_display(sname, since)
 
     return {"data": data, "last_update": last_update}
@@ -925,15 +932,13 @@ async def download_session_export(
     """
     a.session_exists(sname)
 
-    return briefcase_export_response(sname, gvar, filters, filetype)
+    return await briefcase_export_response(sname, gvar, filters, filetype)
 
 
 @router.get("/sessions/{sname}/data/jsonl/")
 async def download_session_jsonl(
     sname: str,
-    format: str = Query(
-        default="ultralong", description="Export format: ultralong, sparse, or latest"
-    ),
+    format: ExportFormat = JsonlFormatQuery,
     gvar: list[str] = JsonlGroupVariablesQuery,
     filters: bool = Query(default=False, description="Apply reasonable filters"),
     bauth: None = Depends(a.require_bearer_token),
@@ -1078,7 +1083,7 @@ async def run_session_pipeline_response(
     filename = f"{sname}-{appname}"
 
     if filetype == "csv":
-        return Response(
+        return StreamingResponse(
             a.generate_custom_csv(rows),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}.csv"},
@@ -1125,7 +1130,7 @@ async def list_rooms(
     bauth: None = Depends(a.require_bearer_token),
 ) -> dict[str, dict[str, Any]]:
     """List all rooms with their configuration."""
-    return dict(a.rooms())
+    return a.rooms()
 
 
 @router.get("/rooms/{roomname}/")
@@ -1345,37 +1350,26 @@ async def create_session_in_room(
     ensure_unames_count(body.n_players, body.unames)
     ensure_assignees_count(body.n_players, body.assignees)
 
+    settings_parsed = (
+        body.settings if body.settings is not None else a.config_settings(body.config)
+    )
+
+    data: list[dict[str, Any]] = [{"label": label} for label in body.assignees]
+    data += [{} for _ in range(body.n_players - len(data))]
+
     with Admin() as admin:
         if admin.rooms[roomname]["sname"] is not None:
             raise HTTPException(
                 status_code=400, detail="Room already has an active session"
             )
 
-    settings_parsed = (
-        body.settings
-        if body.settings is not None
-        else u.CONFIGS_EXTRA.get(body.config, {}).get("settings", {})
-    )
-
-    assignees_list: list[Any] = body.assignees or []
-
-    data: list[Any] = []
-
-    if body.n_players > len(assignees_list):
-        assignees_list.extend([None] * (body.n_players - len(assignees_list)))
-
-    for label in assignees_list[: body.n_players]:
-        if label is None:
-            data.append({})
-        else:
-            data.append({"label": label})
-
-    with Admin() as admin:
         sid = c.create_session(
             admin,
             body.config,
             sname=body.sname,
             settings=settings_parsed,
+            room=roomname,
+            simulate=body.simulate,
         )
 
         admin.rooms[roomname]["sname"] = sid.sname
@@ -1385,11 +1379,6 @@ async def create_session_in_room(
             admin.rooms[roomname]["capacity"] = body.n_players
 
     with t.materialize(sid) as session:
-        session.room = roomname
-
-        if body.simulate:
-            session._uproot_simulate = True
-
         c.create_players(
             session,
             n=body.n_players,
@@ -1457,7 +1446,7 @@ async def get_config(
         "name": cname,
         "summary": a.config_summary(cname),
         "apps": u.CONFIGS[cname],
-        "settings": u.CONFIGS_EXTRA.get(cname, {}).get("settings", {}),
+        "settings": a.config_settings(cname),
         "suggested_multiple": u.CONFIGS_EXTRA.get(cname, {}).get(
             "suggested_multiple", 1
         ),
@@ -1602,10 +1591,7 @@ async def get_status(
     """Get status information."""
     dbsize_bytes = d.DATABASE.size()
     dbsize = float(dbsize_bytes) / (1024**2) if dbsize_bytes is not None else None
-    packages = {
-        dist.metadata["name"]: dist.version
-        for dist in importlib.metadata.distributions()
-    }
+    packages = c.installed_packages()
 
     return {
         "versions": {
@@ -3,6 +3,7 @@
 
 """Authentication and authorization service."""
 
+import functools
 import hashlib
 import hmac
 import time
@@ -12,13 +13,19 @@ from types import EllipsisType
 from typing import Any, cast
 
 from fastapi import Header, HTTPException
-from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from itsdangerous import (
+    BadSignature,
+    SignatureExpired,
+    TimestampSigner,
+    URLSafeTimedSerializer,
+)
 from starlette.concurrency import run_in_threadpool
 
 import uproot as u
 import uproot.deployment as d
 import uproot.storage as s
 import uproot.types as t
+from uproot import cache
 
 # Module-level state for admin credentials
 ADMINS: dict[str, str | EllipsisType] = {}
@@ -42,6 +49,10 @@ POW_DIFFICULTY = "0000"  # 16 bits; ≈ 1 s in-browser, ≈ 65k hashes for an at
 POW_MAX_AGE = 120  # seconds; challenges expire to bound memory of POW_USED
 POW_USED: OrderedDict[str, int] = OrderedDict()
 
+TOKEN_MAX_AGE = 86400  # seconds
+# Tokens whose signature has been checked: token -> (secret key, payload, signed at)
+VERIFIED_TOKENS: dict[str, tuple[str, Any, int]] = {}
+
 
 def ensure_globals() -> None:
     """Initialize global admin credentials from deployment config."""
@@ -64,9 +75,18 @@ def get_secret_key() -> str:
     return cast(str, ADMINS_SECRET_KEY)
 
 
+@functools.lru_cache(maxsize=1)
+def serializer_for(secret_key: str) -> URLSafeTimedSerializer:
+    # itsdangerous derives the signing key from the secret for every dumps() and
+    # loads(). It is derived once here instead; tokens stay byte-for-byte the same.
+    signing_key = TimestampSigner(secret_key, salt=b"itsdangerous").derive_key()
+
+    return URLSafeTimedSerializer(signing_key, signer_kwargs={"key_derivation": "none"})
+
+
 def get_serializer() -> URLSafeTimedSerializer:
-    """Get configured token serializer."""
-    return URLSafeTimedSerializer(get_secret_key())
+    """Get configured token serializer (one per secret key)."""
+    return serializer_for(get_secret_key())
 
 
 def admin_password_salt(user: str) -> bytes:
@@ -127,32 +147,66 @@ def get_active_tokens() -> set[str]:
         return getattr(admin, "active_auth_tokens", set())
 
 
-def store_active_tokens(tokens: set[str], cleanup: bool = True) -> None:
-    """Store set of active tokens to storage."""
+def token_active(token: str) -> bool:
+    """Check whether a token is in the active set.
+
+    The stored set is inspected in place; get_active_tokens() would copy it.
+    """
+    admin = cache.get_namespace(("admin",))
+    history = admin.get("active_auth_tokens") if admin is not None else None
+
+    if not history or history[-1].unavailable:
+        return False
+
+    return token in history[-1].data
+
+
+def token_payload(token: str) -> Any:
+    """Return the payload of a signed token that is not older than TOKEN_MAX_AGE.
+
+    The signature of each token is only verified once; later calls merely check
+    its age. Raises BadSignature or SignatureExpired like serializer.loads().
+    """
+    secret = get_secret_key()
+    verified = VERIFIED_TOKENS.get(token)
+
+    if verified is None or verified[0] != secret:
+        data, signed_at = get_serializer().loads(
+            token, max_age=TOKEN_MAX_AGE, return_timestamp=True
+        )
+        verified = VERIFIED_TOKENS[token] = (secret, data, int(signed_at.timestamp()))
+    elif int(time.time()) - verified[2] > TOKEN_MAX_AGE:
+        del VERIFIED_TOKENS[token]
+
+        raise SignatureExpired("Token expired")
+
+    return verified[1]
+
+
+def store_active_tokens(tokens: set[str]) -> None:
+    """Store set of active tokens to storage. Expired tokens are swept separately
+    by the token_sweeper job; until then, they are rejected by token_payload()."""
     with s.Admin() as admin:
         admin.active_auth_tokens = tokens
 
-    # Optionally clean up expired tokens when storing active ones
-    if cleanup:
-        cleanup_expired_tokens()
+    for token in VERIFIED_TOKENS.keys() - tokens:
+        del VERIFIED_TOKENS[token]
 
 
 def cleanup_expired_tokens() -> None:
     """Remove expired tokens from storage."""
-    serializer = get_serializer()
     active_tokens = get_active_tokens()
     valid_tokens = set()
 
     for token in active_tokens:
         try:
-            serializer.loads(token, max_age=86400)  # 24 hours
+            token_payload(token)
             valid_tokens.add(token)
         except (BadSignature, SignatureExpired):
             continue  # Token is expired or invalid, don't keep it
 
     if len(valid_tokens) != len(active_tokens):
-        # Store without triggering cleanup again to avoid recursion
-        store_active_tokens(valid_tokens, cleanup=False)
+        store_active_tokens(valid_tokens)
 
 
 def create_token_internal(user: str) -> str:
@@ -277,14 +331,13 @@ def revoke_all_user_tokens(user: str) -> int:
     Returns:
         Number of tokens revoked
     """
-    serializer = get_serializer()
     active_tokens = get_active_tokens()
     tokens_to_keep = set()
     revoked_count = 0
 
     for token in active_tokens:
         try:
-            data = serializer.loads(token, max_age=86400)
+            data = token_payload(token)
             if isinstance(data, dict) and data.get("user") != user:
                 tokens_to_keep.add(token)
             else:
@@ -302,30 +355,24 @@ def get_active_auth_sessions() -> dict[str, dict[str, Any]]:
     Returns:
         Dict mapping usernames to session info
     """
-    serializer = get_serializer()
-    active_tokens = get_active_tokens()
-    sessions = {}
+    sessions: dict[str, dict[str, Any]] = {}
 
-    for token in active_tokens:
+    for token in get_active_tokens():
         try:
-            data = serializer.loads(token, max_age=86400)
-            if isinstance(data, dict) and "user" in data:
-                user = data["user"]
-                if user not in sessions:
-                    sessions[user] = {  # nosec
-                        "token_count": 0,
-                        "created_at": [],
-                    }
-                token_count = sessions[user]["token_count"]
-                if isinstance(token_count, int):
-                    sessions[user]["token_count"] = token_count + 1
-                if "created_at" in data:
-                    created_at_list = sessions[user]["created_at"]
-                    if isinstance(created_at_list, list):
-                        created_at_list.append(data["created_at"])
+            data = token_payload(token)
         except (BadSignature, SignatureExpired):
             continue
 
+        if isinstance(data, dict) and "user" in data:
+            session = sessions.setdefault(
+                data["user"],
+                {"token_count": 0, "created_at": []},
+            )
+            session["token_count"] += 1
+
+            if "created_at" in data:
+                session["created_at"].append(data["created_at"])
+
     return sessions
 
 
@@ -340,18 +387,15 @@ def from_cookie(uauth: str | None) -> dict[str, str]:
             "token": "",  # nosec
         }
     try:
-        serializer = get_serializer()
-        active_tokens = get_active_tokens()
-
         # Verify token is in active set and not expired
-        if uauth not in active_tokens:
+        if not token_active(uauth):
             return {
                 "user": "",
                 "token": "",  # nosec
             }
 
         # Verify token signature and expiration (24 hours)
-        data = serializer.loads(uauth, max_age=86400)
+        data = token_payload(uauth)
 
         if not isinstance(data, dict) or "user" not in data:
             return {
@@ -381,15 +425,12 @@ def verify_auth_token(user: str, token: str) -> str | None:
         return None
 
     try:
-        serializer = get_serializer()
-        active_tokens = get_active_tokens()
-
         # Check if token is in active set
-        if token not in active_tokens:
+        if not token_active(token):
             return None
 
         # Verify token signature and expiration
-        data = serializer.loads(token, max_age=86400)
+        data = token_payload(token)
 
         if not isinstance(data, dict) or data.get("user") != user:
             return None
@@ -473,22 +514,25 @@ def verify_bearer_token(authorization: str | None) -> bool:
     Returns:
         True if the token is valid, False otherwise
     """
-    if not authorization:
+    # API_KEYS is read per call because deployments fill it after import. Every
+    # key is compared in constant time rather than through a hash lookup.
+    if not authorization or not d.API_KEYS:
         return False
 
-    # Check if it starts with "Bearer "
-    if not authorization.startswith("Bearer "):
+    if authorization[:7] != "Bearer ":
         return False
 
-    # Extract the token
-    token = authorization[7:]  # Remove "Bearer " prefix
+    token = authorization[7:]
 
     return any(hmac.compare_digest(token, key) for key in d.API_KEYS)
 
 
-def require_bearer_token(authorization: str | None = Header(None)) -> None:
+async def require_bearer_token(authorization: str | None = Header(None)) -> None:
     """FastAPI dependency that validates Bearer token from Authorization header.
 
+    This is a coroutine so that FastAPI runs it on the event loop instead of
+    dispatching every API request to the threadpool.
+
     Raises:
         HTTPException: 401 if authentication fails
     """
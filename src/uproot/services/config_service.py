@@ -3,6 +3,7 @@
 
 """Configuration management service."""
 
+import functools
 from time import time
 from typing import Any, cast
 
@@ -13,6 +14,8 @@ from sortedcontainers import SortedDict
 import uproot as u
 import uproot.storage as s
 
+HTTP_CLIENT: httpx.AsyncClient | None = None
+
 
 def config_summary(cname: str) -> str:
     """Get a summary description for a configuration."""
@@ -25,6 +28,13 @@ def config_summary(cname: str) -> str:
         return ""
 
 
+def config_settings(cname: str) -> dict[str, Any]:
+    """Get the default settings of a configuration ({} for unknown ones)."""
+    extra = u.CONFIGS_EXTRA.get(cname)
+
+    return cast(dict[str, Any], extra["settings"]) if extra is not None else {}
+
+
 def displaystr(s: str) -> str:
     """Truncate a string for display."""
     s = s.strip()
@@ -35,20 +45,37 @@ def displaystr(s: str) -> str:
     return s
 
 
+@functools.lru_cache(maxsize=1)
 def configs() -> dict[str, SortedDict[str, str]]:
-    """Get all configurations organized by type."""
-    return {
-        "configs": SortedDict(
-            {
-                c: displaystr(config_summary(c))
-                for c in u.CONFIGS
-                if not c.startswith("~")
-            }
-        ),
-        "apps": SortedDict(
-            {c: displaystr(config_summary(c)) for c in u.CONFIGS if c.startswith("~")}
-        ),
-    }
+    """Get all configurations organized by type. The result is cached until
+    configs.cache_clear() is called, which happens whenever a config is loaded or
+    an app is (re)imported. Do not mutate it."""
+    regular: dict[str, str] = {}
+    apps: dict[str, str] = {}
+
+    for c in u.CONFIGS:
+        (apps if c.startswith("~") else regular)[c] = displaystr(config_summary(c))
+
+    return {"configs": SortedDict(regular), "apps": SortedDict(apps)}
+
+
+def http_client() -> httpx.AsyncClient:
+    """Get the client shared by all requests to the maintainers' server, so that
+    its connections are pooled. It is closed by close_http_client()."""
+    global HTTP_CLIENT
+
+    if HTTP_CLIENT is None or HTTP_CLIENT.is_closed:
+        HTTP_CLIENT = httpx.AsyncClient(follow_redirects=True)
+
+    return HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    global HTTP_CLIENT
+
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+        HTTP_CLIENT = None
 
 
 def version_is_current(current: str, recommended: str) -> bool:
@@ -68,10 +95,9 @@ async def announcements() -> dict[str, Any]:
     ANNOUNCEMENTS_URL = "https://uproot.science/announcements.json"
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(ANNOUNCEMENTS_URL)
-            data = cast(dict[str, Any], response.json())
-            recommended = str(data["recommendedVersion"])
+        response = await http_client().get(ANNOUNCEMENTS_URL)
+        data = cast(dict[str, Any], response.json())
+        recommended = str(data["recommendedVersion"])
     except (httpx.HTTPError, KeyError, TypeError, ValueError):
         return {"error": True}
 
@@ -95,8 +121,7 @@ async def praise() -> str:
     PRAISE_URL = "https://uproot.science/praise/"
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(PRAISE_URL)
-            return response.text
+        response = await http_client().get(PRAISE_URL)
+        return response.text
     except Exception:  # noqa: BLE001
         return "We couldn't load praise right now."
@@ -12,10 +12,12 @@ from typing import (
     Annotated,
     Any,
     TypeAlias,
-    cast,
 )
 
+from starlette.concurrency import run_in_threadpool
+
 import uproot
+import uproot.events as e
 import uproot.storage as s
 import uproot.types as t
 from uproot import cache, data
@@ -40,15 +42,13 @@ def everything_from_session(
     matches: dict[tuple[str, ...], Any] = {}
     sname = str(sname)
 
+    # The history is entirely in memory, so the session's namespace is taken
+    # from the level that was just checked instead of being looked up again
     for lvl1_k, lvl1_v in cache.MEMORY_HISTORY.items():
-        if isinstance(lvl1_v, dict) and sname in lvl1_v:
-            k = (
-                lvl1_k,
-                sname,
-            )
-            namespace = cache.get_namespace(k)
-            if namespace is not None:
-                matches |= cache.flatten(namespace, k)
+        if isinstance(lvl1_v, dict) and isinstance(
+            namespace := lvl1_v.get(sname), dict
+        ):
+            matches |= cache.flatten(namespace, (lvl1_k, sname))
 
     return matches
 
@@ -59,7 +59,10 @@ def data_display(x: Any) -> str:
     This is similar to data.value2json and data.json2csv, but a bit simpler
     The intention is to provide a user-friendly string representation of 'x'
     """
-    if isinstance(x, (bytearray, bytes)):
+    if type(x) is str:
+        # The most common case, and str(x) would return x anyway
+        return x
+    elif isinstance(x, (bytearray, bytes)):
         # Nobody wants to view that in the browser (not in that form at least)
         return "[Binary]"
     else:
@@ -83,44 +86,69 @@ async def everything_from_session_display(
     retval: dict[str, dict[str, list[DisplayValue]]] = {}
     last_update: float = since_epoch
 
+    if not session_changed_since(sname, since_epoch):
+        return retval, last_update
+
     for uname, fields in cache.MEMORY_HISTORY.get("player", {}).get(sname, {}).items():
         retval[uname] = {}
 
         for field, values in fields.items():
-            retval[uname][field] = displayvalues = [
-                cast(
-                    DisplayValue,
-                    (
-                        val.time,
-                        val.unavailable,
-                        type(val.data).__name__,
-                        data_display(val.data),
-                        val.context,
-                    ),
-                )
-                for val in values
-                if val.time is not None and val.time > since_epoch
-            ]
+            # Histories are in time order, so everything up to since_epoch can
+            # be skipped without building display tuples for it
+            start = (
+                bisect_right(values, since_epoch, key=value_time) if since_epoch else 0
+            )
+
+            if start == len(values):
+                continue
+
+            displayvalues: list[DisplayValue] = []
+            last_time = since_epoch
+
+            for val in values[start:]:
+                if val.time is not None and val.time > since_epoch:
+                    last_time = val.time
+                    displayvalues.append(
+                        (
+                            val.time,
+                            val.unavailable,
+                            type(val.data).__name__,
+                            data_display(val.data),
+                            val.context,
+                        )
+                    )
 
             if displayvalues:
-                if (
-                    isinstance(displayvalues[-1][0], float)
-                    and displayvalues[-1][0] > last_update
-                ):
-                    last_update = displayvalues[-1][0]
-            else:
-                del retval[uname][field]
+                retval[uname][field] = displayvalues
+                last_update = max(last_update, last_time)
 
         if not retval[uname]:
             del retval[uname]
 
         await asyncio.sleep(0)
 
+    # Writes during the walk have already stored a later time
+    e.PLAYERS_CHANGED.setdefault(sname, last_update)
+
     return retval, last_update
 
 
-def data_rows_for_session(sname: t.Sessionname, filters: bool) -> DataRows:
-    rows: DataRows = data.partial_matrix(everything_from_session(sname))
+def value_time(value: t.Value) -> float:
+    return value.time if value.time is not None else 0.0
+
+
+def session_changed_since(sname: t.Sessionname, since_epoch: float) -> bool:
+    """Whether player data of a session may have changed after since_epoch. This
+    is only known after a write or a full walk of the session's data."""
+    changed = e.PLAYERS_CHANGED.get(sname)
+
+    return changed is None or changed > since_epoch
+
+
+def data_rows(
+    everything: dict[tuple[str, ...], list[t.Value]], filters: bool
+) -> DataRows:
+    rows: DataRows = data.partial_matrix(everything)
 
     if filters:
         rows = data.reasonable_filters(rows)
@@ -128,6 +156,10 @@ def data_rows_for_session(sname: t.Sessionname, filters: bool) -> DataRows:
     return rows
 
 
+def data_rows_for_session(sname: t.Sessionname, filters: bool) -> DataRows:
+    return data_rows(everything_from_session(sname), filters)
+
+
 def generate_data(
     sname: t.Sessionname,
     format: str,
@@ -229,7 +261,7 @@ def briefcase_readme(
     )
 
 
-def generate_briefcase(
+async def generate_briefcase(
     sname: t.Sessionname,
     gvar: list[str],
     filters: bool,
@@ -239,10 +271,32 @@ def generate_briefcase(
 
     The briefcase always contains the ultralong, sparse, and latest formats
     as well as the page times; a non-empty `gvar` adds a grouped "latest"
-    format on top.
+    format on top. The session is read on the event loop, but reshaping and
+    compressing the data happen in a worker thread.
     """
-    gvar = [gv for gv in gvar if gv]
-    rows = list(data_rows_for_session(sname, filters))
+    everything = everything_from_session(sname)
+    page_times = page_times_rows(sname)
+
+    return await run_in_threadpool(
+        briefcase_bytes,
+        str(sname),
+        everything,
+        page_times,
+        [gv for gv in gvar if gv],
+        filters,
+        filetype,
+    )
+
+
+def briefcase_bytes(
+    sname: str,
+    everything: dict[tuple[str, ...], list[t.Value]],
+    page_times: list[dict[str, Any]],
+    gvar: list[str],
+    filters: bool,
+    filetype: str,
+) -> bytes:
+    rows = list(data_rows(everything, filters))
 
     formats: dict[str, DataRows] = {
         "ultralong": data.noop(rows),
@@ -255,13 +309,11 @@ def generate_briefcase(
 
     return data.briefcase_out(
         formats,
-        wrapper=str(sname),
+        wrapper=sname,
         filetype=filetype,
-        readme=briefcase_readme(str(sname), filetype, gvar, filters),
+        readme=briefcase_readme(sname, filetype, gvar, filters),
         extras={
-            f"page_times.{filetype}": data.rows_to_bytes(
-                page_times_rows(sname), filetype
-            ),
+            f"page_times.{filetype}": data.rows_to_bytes(page_times, filetype),
         },
     )
 
@@ -274,8 +326,12 @@ def is_custom_data_export(value: Any) -> bool:
     )
 
 
-def generate_custom_csv(rows: list[dict[str, Any]]) -> str:
-    return data.csv_out(rows)
+async def generate_custom_csv(
+    rows: list[dict[str, Any]],
+) -> AsyncGenerator[str, None]:
+    async for chunk in data.csv_stream(rows):
+        yield chunk
+        await asyncio.sleep(0)
 
 
 async def generate_custom_jsonl(
@@ -318,53 +374,56 @@ def page_times_rows(sname: t.Sessionname) -> list[dict[str, Any]]:
         for pid in session._uproot_players:
             uname = pid.uname
 
-            with t.materialize(pid) as player:
-                one_row = False
-                history = player.__history__()
-                last_order = None
-
-                show_pages = history.get("show_page", [])  # type: ignore[var-annotated]
-                page_orders = history.get("page_order", [])  # type: ignore[var-annotated]
-
-                for show_page in show_pages:
-                    if not isinstance(show_page.data, int):
-                        continue
-
-                    # Binary search for the last page_order with time <= show_page.time.
-                    if page_orders:
-                        idx = bisect_right(
-                            page_orders, show_page.time, key=lambda v: v.time
-                        )
-                        if idx > 0:
-                            last_order = page_orders[idx - 1].data
-
-                    page_name = None
-
-                    if isinstance(last_order, list):
-                        if show_page.data == len(last_order):
-                            page_name = "(End)"
-                        elif show_page.data == -1:
-                            page_name = "(Initialize)"
-                        else:
-                            try:
-                                page_name = last_order[show_page.data]
-                            except (TypeError, IndexError):
-                                pass
-
-                    if one_row:
-                        times[-1]["left"] = show_page.time
-
-                    times.append(
-                        {
-                            "sname": sname,
-                            "uname": uname,
-                            "show_page": show_page.data,
-                            "page_name": page_name,
-                            "entered": show_page.time,
-                            "left": None,
-                            "context": show_page.context,
-                        }
-                    )
-                    one_row = True
+            # Only two fields are needed, so they are read from the history
+            # instead of copying every field's history through a player context
+            history = cache.get_namespace(("player", pid.sname, uname)) or {}
+            one_row = False
+            last_order = None
+            order_ix = 0
+
+            show_pages = history.get("show_page", [])
+            page_orders = history.get("page_order", [])
+
+            for show_page in show_pages:
+                if not isinstance(show_page.data, int):
+                    continue
+
+                # Both histories are in time order, so the page_order in effect
+                # (the last one with time <= show_page.time) only moves forward
+                while (
+                    order_ix < len(page_orders)
+                    and page_orders[order_ix].time <= show_page.time
+                ):
+                    last_order = page_orders[order_ix].data
+                    order_ix += 1
+
+                page_name = None
+
+                if isinstance(last_order, list):
+                    if show_page.data == len(last_order):
+                        page_name = "(End)"
+                    elif show_page.data == -1:
+                        page_name = "(Initialize)"
+                    else:
+                        try:
+                            page_name = last_order[show_page.data]
+                        except (TypeError, IndexError):
+                            pass
+
+                if one_row:
+                    times[-1]["left"] = show_page.time
+
+                times.append(
+                    {
+                        "sname": sname,
+                        "uname": uname,
+                        "show_page": show_page.data,
+                        "page_name": page_name,
+                        "entered": show_page.time,
+                        "left": None,
+                        "context": show_page.context,
+                    }
+                )
+                one_row = True
 
     return times
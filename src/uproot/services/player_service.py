@@ -3,56 +3,73 @@
 
 """Player operations service."""
 
+from collections.abc import Callable, Sequence
 from math import isfinite
 from time import time
-from typing import Any
+from typing import Any, cast
 
 import uproot as u
+import uproot.core as c
 import uproot.deployment as d
 import uproot.queues as q
 import uproot.storage as s
 import uproot.types as t
-from uproot import chat
+from uproot import cache, chat
 from uproot.core import resolve_page_order
 from uproot.services.session_service import session_exists
 
+ONLINE_FIELDS = ("id", "page_order", "show_page")
+
+# Entries are only read by consumers, so one reload entry serves every player
+# (see queues.enqueue_many)
+RELOAD: q.EntryType = {
+    "source": "admin",
+    "kind": "action",
+    "payload": {
+        "action": "reload",
+    },
+}
+
 
 async def info_online(sname: t.Sessionname) -> dict[t.Username, Any]:
     """Get online status and info for all players in a session."""
-    online = u.ONLINE[sname]
-    rawinfo: dict[t.Username, dict[str, Any]] = (
-        await fields_from_all(sname, ["id", "page_order", "show_page"])
-        if not sname.startswith("^")
-        else {}
-    )
+    if sname.startswith("^"):
+        # Rooms have no players, only visitors who are online
+        return {"info": {}, "online": u.ONLINE[sname]}
 
     return {
         "info": {
-            k: (v["id"], v["page_order"], v["show_page"]) for k, v in rawinfo.items()
+            pid.uname: player_values(pid, ONLINE_FIELDS)
+            for pid in session_players(sname)
         },
-        "online": online,
+        "online": u.ONLINE[sname],
     }
 
 
-async def fields_from_all(
-    sname: t.Sessionname,
-    fields: list[str],
-) -> dict[t.Username, dict[str, Any]]:
-    """Get specified fields from all players in a session."""
-    retval: dict[t.Username, dict[str, Any]] = {}
+def session_players(sname: t.Sessionname) -> list[t.PlayerIdentifier]:
+    """Get the players of a session ([] for unknown sessions) without entering a
+    session context, which would copy the list. Do not mutate it."""
+    (players,) = cache.latest_values(("session", sname), ("_uproot_players",))
 
-    with s.Session(sname) as session:
-        if not session:
-            return retval
+    return cast(list[t.PlayerIdentifier], players or [])
 
-        for pid in session._uproot_players:
-            with t.materialize(pid) as player:
-                retval[pid.uname] = {}
 
-                for field in fields:
-                    retval[pid.uname][field] = player.get(field)
+def player_values(pid: t.PlayerIdentifier, fields: Sequence[str]) -> tuple[Any, ...]:
+    """Get the latest values of fields (None if unset) without entering a player
+    context. Do not mutate them."""
+    return cache.latest_values(("player", pid.sname, pid.uname), fields)
 
-    return retval
+
+async def fields_from_all(
+    sname: t.Sessionname,
+    fields: list[str],
+) -> dict[t.Username, dict[str, Any]]:
+    """Get specified fields (None if unset) from all players in a session. Do not
+    mutate the values."""
+    return {
+        pid.uname: dict(zip(fields, player_values(pid, fields), strict=True))
+        for pid in session_players(sname)
+    }
 
 
 async def insert_fields(
@@ -69,17 +86,8 @@ async def insert_fields(
             for k, v in fields.items():
                 setattr(player, k, v)
 
-            if reload:
-                q.enqueue(
-                    tuple(pid),
-                    {
-                        "source": "admin",
-                        "kind": "action",
-                        "payload": {
-                            "action": "reload",
-                        },
-                    },
-                )
+    if reload:
+        q.enqueue_many([(sname, uname) for uname in unames], RELOAD)
 
 
 async def run_new_player(sname: t.Sessionname, unames: list[str]) -> None:
@@ -183,29 +191,50 @@ async def mark_dropout(
     return await info_online(sname)
 
 
+def move_players(
+    sname: t.Sessionname,
+    unames: list[str],
+    move: Callable[[int, int], int | None],
+) -> None:
+    """Set show_page to move(show_page, number of pages) for each player and
+    reload those that moved. Both fields are read from the store's history and
+    show_page is an int, so no player context is needed."""
+    known = set(session_players(sname))
+    pids = [t.PlayerIdentifier(sname, uname) for uname in unames]
+    invalid_unames = [pid.uname for pid in pids if pid not in known]
+
+    if invalid_unames:
+        raise ValueError(
+            f"Player {invalid_unames[0]!r} does not exist in session {sname!r}"
+        )
+
+    moved: list[q.PathType] = []
+
+    for pid in pids:
+        show_page, page_order = player_values(pid, ("show_page", "page_order"))
+
+        if not isinstance(show_page, int) or page_order is None:
+            continue
+
+        target = move(show_page, len(page_order))
+
+        if target is not None:
+            t.materialize(pid).show_page = target
+            moved.append((sname, pid.uname))
+
+    q.enqueue_many(moved, RELOAD)
+
+
 async def advance_by_one(
     sname: t.Sessionname, unames: list[str]
 ) -> dict[str, dict[t.Username, Any]]:
     """Advance players by one page."""
     session_exists(sname, False)
-
-    for uname in unames:
-        pid = t.PlayerIdentifier(sname, uname)
-
-        with t.materialize(pid) as player:
-            if -1 < player.show_page < len(player.page_order):
-                player.show_page += 1
-
-                q.enqueue(
-                    tuple(pid),
-                    {
-                        "source": "admin",
-                        "kind": "action",
-                        "payload": {
-                            "action": "reload",
-                        },
-                    },
-                )
+    move_players(
+        sname,
+        unames,
+        lambda show_page, n: show_page + 1 if -1 < show_page < n else None,
+    )
 
     return await info_online(sname)
 
@@ -215,24 +244,7 @@ async def put_to_end(
 ) -> dict[str, dict[str, Any]]:
     """Put players to the end of their page order."""
     session_exists(sname, False)
-
-    for uname in unames:
-        pid = t.PlayerIdentifier(sname, uname)
-
-        with t.materialize(pid) as player:
-            if player.show_page < len(player.page_order):
-                player.show_page = len(player.page_order)
-
-                q.enqueue(
-                    tuple(pid),
-                    {
-                        "source": "admin",
-                        "kind": "action",
-                        "payload": {
-                            "action": "reload",
-                        },
-                    },
-                )
+    move_players(sname, unames, lambda show_page, n: n if show_page < n else None)
 
     return await info_online(sname)
 
@@ -242,24 +254,11 @@ async def revert_by_one(
 ) -> dict[str, dict[str, Any]]:
     """Revert players by one page."""
     session_exists(sname, False)
-
-    for uname in unames:
-        pid = t.PlayerIdentifier(sname, uname)
-
-        with t.materialize(pid) as player:
-            if -1 < player.show_page <= len(player.page_order):
-                player.show_page -= 1
-
-                q.enqueue(
-                    tuple(pid),
-                    {
-                        "source": "admin",
-                        "kind": "action",
-                        "payload": {
-                            "action": "reload",
-                        },
-                    },
-                )
+    move_players(
+        sname,
+        unames,
+        lambda show_page, n: show_page - 1 if -1 < show_page <= n else None,
+    )
 
     return await info_online(sname)
 
@@ -267,20 +266,7 @@ async def revert_by_one(
 async def reload(sname: t.Sessionname, unames: list[str]) -> None:
     """Force reload for specified players."""
     session_exists(sname, False)
-
-    for uname in unames:
-        ptuple = sname, uname
-
-        q.enqueue(
-            ptuple,
-            {
-                "source": "admin",
-                "kind": "action",
-                "payload": {
-                    "action": "reload",
-                },
-            },
-        )
+    q.enqueue_many([(sname, uname) for uname in unames], RELOAD)
 
 
 async def adjust_timeout(
@@ -324,40 +310,34 @@ async def redirect(sname: t.Sessionname, unames: list[str], url: str) -> None:
     """Redirect specified players to a URL."""
     session_exists(sname, False)
 
-    if not url.startswith("http://") and not url.startswith("https://"):
+    if not url.startswith(("http://", "https://")):
         raise ValueError("URL must start with http:// or https://")
 
-    for uname in unames:
-        ptuple = sname, uname
-
-        q.enqueue(
-            ptuple,
-            {
-                "source": "admin",
-                "kind": "action",
-                "payload": {
-                    "action": "redirect",
-                    "url": url,
-                },
+    q.enqueue_many(
+        [(sname, uname) for uname in unames],
+        {
+            "source": "admin",
+            "kind": "action",
+            "payload": {
+                "action": "redirect",
+                "url": url,
             },
-        )
+        },
+    )
 
 
 async def adminmessage(sname: t.Sessionname, unames: list[str], msg: str) -> None:
     """Send an admin message to specified players."""
     session_exists(sname, False)
 
-    for uname in unames:
-        ptuple = sname, uname
-
-        q.enqueue(
-            ptuple,
-            {
-                "source": "adminmessage",
-                "data": msg,
-                "event": "_uproot_AdminMessaged",
-            },
-        )
+    q.enqueue_many(
+        [(sname, uname) for uname in unames],
+        {
+            "source": "adminmessage",
+            "data": msg,
+            "event": "_uproot_AdminMessaged",
+        },
+    )
 
 
 def adminchat_summary(pid: t.PlayerIdentifier) -> dict[str, Any]:
@@ -552,8 +532,6 @@ async def group_players(
     Returns:
         Result dict with info about created/modified groups
     """
-    import uproot.core as c
-
     session_exists(sname, False)
 
     sid = t.SessionIdentifier(sname)
@@ -607,17 +585,6 @@ async def group_players(
 
     # Optionally reload player pages
     if reload:
-        for uname in unames:
-            ptuple = sname, uname
-            q.enqueue(
-                ptuple,
-                {
-                    "source": "admin",
-                    "kind": "action",
-                    "payload": {
-                        "action": "reload",
-                    },
-                },
-            )
+        q.enqueue_many([(sname, uname) for uname in unames], RELOAD)
 
     return result
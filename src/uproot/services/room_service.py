@@ -6,7 +6,6 @@
 from typing import Any, cast
 
 from fastapi import HTTPException
-from sortedcontainers import SortedDict
 
 import uproot.deployment as d
 import uproot.rooms as r
@@ -30,13 +29,13 @@ def room_exists(roomname: str, raise_http: bool = True) -> None:
                 raise ValueError("Invalid room")
 
 
-def rooms() -> SortedDict[str, dict[str, Any]]:
-    """Get all rooms."""
+def rooms() -> dict[str, dict[str, Any]]:
+    """Get all rooms, ordered by name."""
     if d.PUBLIC_DEMO:
-        return SortedDict()
+        return {}
 
     with s.Admin() as admin:
-        return SortedDict(cast(dict[str, Any], admin.rooms))
+        return dict(sorted(cast(dict[str, Any], admin.rooms).items()))
 
 
 def ensure_session_available_for_room(
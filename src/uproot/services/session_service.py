@@ -12,13 +12,32 @@ import uproot as u
 import uproot.deployment as d
 import uproot.storage as s
 import uproot.types as t
+from uproot import cache
 from uproot.types import ensure_awaitable
 
+# Sessions are never removed from a running server, so a session that was found
+# once does not have to be looked up in the admin storage again
+KNOWN_SESSIONS: set[str] = set()
+
+SESSION_STATS_FIELDS = (
+    "active",
+    "config",
+    "room",
+    "description",
+    "_uproot_players",
+    "_uproot_groups",
+)
+
 
 class PipelineInvocationError(TypeError):
     pass
 
 
+def forget_sessions() -> None:
+    """Drop all cached session names, e.g., after the database was reset."""
+    KNOWN_SESSIONS.clear()
+
+
 def session_exists(sname: t.Sessionname, raise_http: bool = True) -> None:
     """Check if a session exists.
 
@@ -26,6 +45,9 @@ def session_exists(sname: t.Sessionname, raise_http: bool = True) -> None:
         sname: Session name to check
         raise_http: If True, raise HTTPException; otherwise raise ValueError
     """
+    if sname in KNOWN_SESSIONS:
+        return
+
     with s.Admin() as admin:
         if sname not in admin._uproot_sessions:
             if raise_http:
@@ -33,6 +55,8 @@ def session_exists(sname: t.Sessionname, raise_http: bool = True) -> None:
             else:
                 raise ValueError("Invalid session")
 
+    KNOWN_SESSIONS.add(sname)
+
 
 def sessions() -> dict[str, dict[str, Any]]:
     """Get all sessions with their stats."""
@@ -44,36 +68,48 @@ def sessions() -> dict[str, dict[str, Any]]:
     with s.Admin() as admin:
         snames = admin._uproot_sessions
 
+    # Sessions are summarized from their histories: entering a context for each
+    # of them would copy their player and group lists only to count them
     for sname in snames:
-        with s.Session(sname) as session:
-            stats[sname] = {
-                "sname": session.name,  # Exactly equal to sname
-                "created": session.__history__()["_uproot_session"][0].time,
-                "active": session.active,
-                "config": session.config,
-                "room": session.room,
-                "description": session.description,
-                "n_players": len(session._uproot_players),
-                "n_groups": len(session._uproot_groups),
-            }
+        namespace = ("session", sname)
+        history = cache.get_namespace(namespace) or {}
+        identity = history.get("_uproot_session")
+        active, config, room, description, players, groups = cache.latest_values(
+            namespace, SESSION_STATS_FIELDS
+        )
+
+        stats[sname] = {
+            "sname": sname,
+            "created": identity[0].time if identity else None,
+            "active": active,
+            "config": config,
+            "room": room,
+            "description": description,
+            "n_players": len(players or ()),
+            "n_groups": len(groups or ()),
+        }
 
     return stats
 
 
-async def flip_active(sname: t.Sessionname) -> None:
-    """Toggle the active status of a session."""
+async def flip_active(sname: t.Sessionname) -> bool:
+    """Toggle the active status of a session and return the new status."""
     session_exists(sname, False)
 
     with s.Session(sname) as session:
-        session.active = not session.active
+        session.active = active = not session.active
+
+    return active
 
 
-async def flip_testing(sname: t.Sessionname) -> None:
-    """Toggle the testing status of a session."""
+async def flip_testing(sname: t.Sessionname) -> bool:
+    """Toggle the testing status of a session and return the new status."""
     session_exists(sname, False)
 
     with s.Session(sname) as session:
-        session._uproot_testing = not session._uproot_testing
+        session._uproot_testing = testing = not session._uproot_testing
+
+    return testing
 
 
 async def run_new_session(sname: t.Sessionname) -> None:
@@ -112,20 +148,22 @@ async def update_settings(sname: t.Sessionname, **newsettings: Any) -> None:
         session._uproot_settings = newsettings
 
 
+def apps_with(sname: t.Sessionname, attribute: str) -> list[str]:
+    """Apps of a session that define attribute. The app list is read from the
+    cached history, so no session context has to be copied for it."""
+    (apps,) = cache.latest_values(("session", sname), ("apps",))
+
+    return [appname for appname in apps or () if hasattr(u.APPS[appname], attribute)]
+
+
 def get_digest(sname: t.Sessionname) -> list[str]:
     """Get list of apps that have digest methods for a session."""
-    with s.Session(sname) as session:
-        apps = session.apps
-
-    return [appname for appname in apps if hasattr(u.APPS[appname], "digest")]
+    return apps_with(sname, "digest")
 
 
 def get_pipelines(sname: t.Sessionname) -> list[str]:
     """Get list of apps that have pipeline methods for a session."""
-    with s.Session(sname) as session:
-        apps = session.apps
-
-    return [appname for appname in apps if hasattr(u.APPS[appname], "pipeline")]
+    return apps_with(sname, "pipeline")
 
 
 def pipeline_call_kwargs(
@@ -1,13 +1,15 @@
 # Copyright Max R. P. Grossmann, Holger Gerhardt, et al., 2025.
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
-import base64
+import binascii
 import csv
+import functools
 import os
 import tempfile
 from collections import namedtuple
 from collections.abc import Awaitable, Callable, Iterable, Sequence
 from decimal import Decimal as cu
+from itertools import chain
 from types import EllipsisType
 from typing import (
     Any,
@@ -28,7 +30,7 @@ from uproot.pages import fmtnum_filter as fmtnum
 from uproot.pages import page2path
 from uproot.pages import to_filter as to
 from uproot.queries import FieldReferent
-from uproot.queues import enqueue
+from uproot.queues import PathType, enqueue, enqueue_many
 from uproot.storage import Admin, Group, Model, Player, Session, Storage
 
 
@@ -251,6 +253,17 @@ def live(method: Callable[..., Any]) -> Callable[..., Any]:
     return newmethod  # type: ignore[return-value]
 
 
+def send_entry(data: Any, event: str, where: int | EllipsisType) -> dict[str, Any]:
+    ensure(where is ... or isinstance(where, int), ValueError)
+
+    return {
+        "source": "send_to",
+        "constraint": None if where is ... else where,
+        "data": data,
+        "event": event,
+    }
+
+
 @flexible
 def send_to_one(
     recipient: Storage,
@@ -259,18 +272,10 @@ def send_to_one(
     *,
     where: int | EllipsisType = ...,
 ) -> None:
-    ensure(where is ... or isinstance(where, int), ValueError)
+    entry = send_entry(data, event, where)
 
     if where is ... or recipient.show_page == where:
-        enqueue(
-            tuple(t.identify(recipient)),
-            {
-                "source": "send_to",
-                "constraint": None if where is ... else where,
-                "data": data,
-                "event": event,
-            },
-        )
+        enqueue(tuple(t.identify(recipient)), entry)
 
 
 def send_to(
@@ -283,8 +288,17 @@ def send_to(
     if is_player_like(recipient):
         send_to_one(recipient, data, event, where=where)
     elif isinstance(recipient, Iterable):
-        for one_recipient in recipient:  # type: ignore[union-attr]
-            send_to_one(one_recipient, data, event, where=where)
+        paths: list[PathType] = []
+
+        for one_recipient in cast(Iterable[PlayerLike], recipient):
+            if isinstance(one_recipient, t.PlayerIdentifier):
+                one_recipient = t.materialize(one_recipient)
+
+            if where is ... or one_recipient.show_page == where:
+                paths.append(tuple(t.identify(one_recipient)))
+
+        # One entry is validated once and shared by all recipients
+        enqueue_many(paths, send_entry(data, event, where))
     else:
         raise TypeError(
             "send_to must be called with a PlayerLike or Iterable[PlayerLike]."
@@ -394,27 +408,30 @@ def data_uri(data: bytes) -> str:
     else:
         mime_type = "application/octet-stream"
 
-    return f"data:{mime_type};base64," + base64.b64encode(data).decode("ascii")
+    encoded = binascii.b2a_base64(data, newline=False).decode("ascii")
+
+    return f"data:{mime_type};base64,{encoded}"
+
+
+@functools.lru_cache(maxsize=1024)
+def tuple_type(typename: str, fields: tuple[str, ...]) -> Any:
+    # namedtuple builds its class from generated source, so each shape is only
+    # built once
+    return namedtuple(typename, fields)  # type: ignore[misc]
 
 
 def combine(named_tuples: Sequence[Any]) -> Any:
     if not named_tuples:
-        return namedtuple("Empty", [])()
-
-    fields = named_tuples[0]._fields
-    keys = [getattr(nt, fields[0]) for nt in named_tuples]
+        return tuple_type("Empty", ())()
 
-    ResultTuple = namedtuple("Result", keys)  # type: ignore[misc]
+    ResultTuple = tuple_type("Result", tuple(nt[0] for nt in named_tuples))
 
-    if len(fields) == 2:
-        values = [getattr(nt, fields[1]) for nt in named_tuples]
-        return ResultTuple(*values)
+    if len(named_tuples[0]) == 2:
+        return ResultTuple(*[nt[1] for nt in named_tuples])
     else:
-        ValueTuple = namedtuple("Value", fields[1:])  # type: ignore[misc]
-        values = [
-            ValueTuple(*[getattr(nt, f) for f in fields[1:]]) for nt in named_tuples
-        ]
-        return ResultTuple(*values)
+        ValueTuple = tuple_type("Value", named_tuples[0]._fields[1:])
+
+        return ResultTuple(*[ValueTuple(*nt[1:]) for nt in named_tuples])
 
 
 def read_csv(infile: str) -> list[dict[str, str]]:
@@ -460,6 +477,58 @@ def append_to_csv(outfile: str, data: dict[str, Any]) -> None:
             os.unlink(tmpname)
 
 
+def marker_span(
+    page_order: list[str], show_page: int, start: str, end: str
+) -> tuple[int, int]:
+    """Find the nearest start marker at or before show_page and its matching end
+    marker. page_order is passed in so that the scans index a plain list instead
+    of going through the player's attribute lookup for every page."""
+    for start_ix in range(show_page, -1, -1):
+        if page_order[start_ix] == start:
+            break
+    else:
+        raise RuntimeError(f"Could not find {start}")
+
+    depth = 1
+
+    for end_ix in range(start_ix + 1, len(page_order)):
+        if page_order[end_ix] == start:
+            depth += 1
+        elif page_order[end_ix] == end:
+            depth -= 1
+
+            if depth == 0:
+                return start_ix, end_ix
+
+    raise RuntimeError(f"Could not find matching {end}")
+
+
+def bracket_groups(pages: list[str]) -> list[list[str]]:
+    """Split pages into top-level items, keeping each bracket group (from "#{"
+    to its matching "#}") together as one item."""
+    grouped_pages = []
+    depth = 0
+    first = 0
+
+    for i, page in enumerate(pages):
+        if page == "#{":
+            depth += 1
+        elif page == "#}":
+            depth -= 1
+
+            if depth < 0:
+                raise RuntimeError("Unmatched closing bracket")
+
+        if depth == 0:
+            grouped_pages.append(pages[first : i + 1])
+            first = i + 1
+
+    if depth > 0:
+        raise RuntimeError("Unmatched opening bracket")
+
+    return grouped_pages
+
+
 class Random(t.SmoothOperator):
     def __init__(self, *pages: t.PageLike) -> None:
         # Call parent __init__ before setting custom pages
@@ -477,71 +546,15 @@ class Random(t.SmoothOperator):
 
     @classmethod
     async def start(page, player: Storage) -> None:
-        # Find the nearest #RandomStart before our position
-        start_ix = None
-        for i in range(player.show_page, -1, -1):
-            if player.page_order[i] == "#RandomStart":
-                start_ix = i
-                break
-
-        if start_ix is None:
-            raise RuntimeError("Could not find #RandomStart")
-
-        # Find the matching #RandomEnd for this #RandomStart
-        random_depth = 1
-        end_ix = None
-        for i in range(start_ix + 1, len(player.page_order)):
-            if player.page_order[i] == "#RandomStart":
-                random_depth += 1
-            elif player.page_order[i] == "#RandomEnd":
-                random_depth -= 1
-                if random_depth == 0:
-                    end_ix = i
-                    break
-
-        if end_ix is None:
-            raise RuntimeError("Could not find matching #RandomEnd")
-
-        pages = player.page_order[start_ix + 1 : end_ix]
-
-        # Group pages by brackets
-        grouped_pages = []
-        i = 0
-        while i < len(pages):
-            if pages[i] == "#{":
-                # Find the matching closing bracket
-                bracket_group = ["#{"]
-                bracket_depth = 1
-                i += 1  # Skip the opening bracket
-
-                while i < len(pages) and bracket_depth > 0:
-                    if pages[i] == "#{":
-                        bracket_depth += 1
-                    elif pages[i] == "#}":
-                        bracket_depth -= 1
-
-                    bracket_group.append(pages[i])
-                    i += 1
-
-                if bracket_depth == 0:
-                    grouped_pages.append(bracket_group)
-                else:
-                    raise RuntimeError("Unmatched opening bracket")
-            elif pages[i] == "#}":
-                raise RuntimeError("Unmatched closing bracket")
-            else:
-                grouped_pages.append([pages[i]])
-                i += 1
+        page_order = player.page_order
+        start_ix, end_ix = marker_span(
+            page_order, player.show_page, "#RandomStart", "#RandomEnd"
+        )
+        grouped_pages = bracket_groups(page_order[start_ix + 1 : end_ix])
 
-        # Shuffle the groups
         rng().shuffle(grouped_pages)
 
-        # Flatten back to page list
-        shuffled_pages = []
-        for group in grouped_pages:
-            shuffled_pages.extend(group)
-
-        player.page_order[start_ix + 1 : end_ix] = shuffled_pages
+        page_order[start_ix + 1 : end_ix] = chain.from_iterable(grouped_pages)
 
 
 class Rounds(t.SmoothOperator):
@@ -556,9 +569,14 @@ class Rounds(t.SmoothOperator):
             INTERNAL_PAGES["}"],
         ]
         self.n = n
+        # Built once here, since expand() runs for every new player
+        self.expanded: list[t.PageLike] = [
+            INTERNAL_PAGES["RoundsReset"],
+            *(n * self.pages),
+        ]
 
     def expand(self) -> list[t.PageLike]:
-        return [INTERNAL_PAGES["RoundsReset"]] + self.n * self.pages
+        return self.expanded
 
     @classmethod
     async def next(page, player: Storage) -> None:
@@ -569,8 +587,7 @@ class Rounds(t.SmoothOperator):
         completed_at_depth: dict[int, int] = {}  # depth -> completed rounds
         current_at_depth: dict[int, int] = {}  # depth -> current round number
 
-        for i in range(player.show_page):
-            page_name = player.page_order[i]
+        for page_name in player.page_order[: player.show_page]:
             if page_name == "#RoundsReset":
                 # A new Rounds() block begins at this depth — reset counters
                 for d in list(completed_at_depth.keys()):
@@ -611,10 +628,8 @@ class Rounds(t.SmoothOperator):
         if round_nested == [1]:
             player.round = 1
         else:
-            if not hasattr(player, "round") or player.round is None:
-                player.round = 1
-            else:
-                player.round += 1
+            current = getattr(player, "round", None)
+            player.round = 1 if current is None else current + 1
 
 
 class Repeat(t.SmoothOperator):
@@ -634,10 +649,11 @@ class Repeat(t.SmoothOperator):
 
     @classmethod
     async def continue_maybe(page, player: Storage) -> None:
-        end_ix = player.page_order.index("#RepeatEnd", player.show_page)
+        page_order = player.page_order
+        end_ix = page_order.index("#RepeatEnd", player.show_page)
 
         for start_ix in range(end_ix - 1, -1, -1):
-            if player.page_order[start_ix] == "#RepeatStart":
+            if page_order[start_ix] == "#RepeatStart":
                 break
         else:
             raise RuntimeError("Could not find #RepeatStart")
@@ -645,18 +661,13 @@ class Repeat(t.SmoothOperator):
         do_continue = player.get("add_round", False)
 
         if do_continue:
-            player.page_order = (
-                player.page_order[: (end_ix + 1)]
-                + player.page_order[start_ix : (end_ix + 1)]
-                + player.page_order[(end_ix + 1) :]
-            )
+            # Like Random.start, this splices the player's page order in place
+            page_order[end_ix + 1 : end_ix + 1] = page_order[start_ix : end_ix + 1]
 
     @classmethod
     async def next(page, player: Storage) -> None:
-        if not hasattr(player, "round") or player.round is None:
-            player.round = 1
-        else:
-            player.round += 1
+        current = getattr(player, "round", None)
+        player.round = 1 if current is None else current + 1
 
 
 class Bracket(t.SmoothOperator):
@@ -698,67 +709,18 @@ class Between(t.SmoothOperator):
 
     @classmethod
     async def start(page, player: Storage) -> None:
-        # Find the nearest #BetweenStart before our position
-        start_ix = None
-        for i in range(player.show_page, -1, -1):
-            if player.page_order[i] == "#BetweenStart":
-                start_ix = i
-                break
+        page_order = player.page_order
+        start_ix, end_ix = marker_span(
+            page_order, player.show_page, "#BetweenStart", "#BetweenEnd"
+        )
+        pages = page_order[start_ix + 1 : end_ix]
 
-        if start_ix is None:
-            raise RuntimeError("Could not find #BetweenStart")
-
-        # Find the matching #BetweenEnd for this #BetweenStart
-        between_depth = 1
-        end_ix = None
-        for i in range(start_ix + 1, len(player.page_order)):
-            if player.page_order[i] == "#BetweenStart":
-                between_depth += 1
-            elif player.page_order[i] == "#BetweenEnd":
-                between_depth -= 1
-                if between_depth == 0:
-                    end_ix = i
-                    break
-
-        if end_ix is None:
-            raise RuntimeError("Could not find matching #BetweenEnd")
-
-        pages = player.page_order[start_ix + 1 : end_ix]
-
-        # Group pages by brackets (each bracket group is one selectable option)
-        grouped_pages: list[list[str]] = []
-        i = 0
-        while i < len(pages):
-            if pages[i] == "#{":
-                # Find the matching closing bracket
-                bracket_group = ["#{"]
-                bracket_depth = 1
-                i += 1  # Skip the opening bracket
-
-                while i < len(pages) and bracket_depth > 0:
-                    if pages[i] == "#{":
-                        bracket_depth += 1
-                    elif pages[i] == "#}":
-                        bracket_depth -= 1
-
-                    bracket_group.append(pages[i])
-                    i += 1
-
-                if bracket_depth == 0:
-                    grouped_pages.append(bracket_group)
-                else:
-                    raise RuntimeError("Unmatched opening bracket")
-            elif pages[i] == "#}":
-                raise RuntimeError("Unmatched closing bracket")
-            else:
-                grouped_pages.append([pages[i]])
-                i += 1
+        # Each bracket group is one selectable option
+        grouped_pages = bracket_groups(pages)
 
         if not grouped_pages:
             # No pages to select from, leave empty
-            player.page_order = (
-                player.page_order[: start_ix + 1] + player.page_order[end_ix:]
-            )
+            player.page_order = page_order[: start_ix + 1] + page_order[end_ix:]
             return
 
         # Randomly select exactly one group
@@ -773,9 +735,7 @@ class Between(t.SmoothOperator):
 
         # Replace the content between markers with just the selected page(s)
         player.page_order = (
-            player.page_order[: start_ix + 1]
-            + selected_group
-            + player.page_order[end_ix:]
+            page_order[: start_ix + 1] + selected_group + page_order[end_ix:]
         )
 
 
@@ -6,6 +6,7 @@ from typing import Any, cast
 
 import appendmuch
 
+from uproot import cache
 from uproot.constraints import ensure, valid_token
 from uproot.types import (
     FrozenDottedDict,
@@ -128,18 +129,24 @@ def virtual_context(storage: Storage) -> Any:
         raise AttributeError
 
 
-def virtual_others_in_session(s: Storage) -> StorageBunch:
+def others_in(s: Storage, namespace: tuple[str, ...]) -> StorageBunch:
+    # The member list is only read, so it is taken from the cached history
+    # instead of being copied through a Storage context on every access
     pid = identify(s)
-    with materialize(s._uproot_session) as session:
-        bunch = session._uproot_players
+    (bunch,) = cache.latest_values(namespace, ("_uproot_players",))
+    ensure(bunch is not None, AttributeError, f"{namespace} has no players")
+
     return StorageBunch([Player(*pid_) for pid_ in bunch if pid_ != pid])
 
 
+def virtual_others_in_session(s: Storage) -> StorageBunch:
+    return others_in(s, ("session", s._uproot_session.sname))
+
+
 def virtual_others_in_group(s: Storage) -> StorageBunch:
-    pid = identify(s)
-    with s.group as g:
-        bunch = g._uproot_players
-    return StorageBunch([Player(*pid_) for pid_ in bunch if pid_ != pid])
+    ensure(s._uproot_group is not None, AttributeError, f"{s} has no group")
+
+    return others_in(s, ("group", *s._uproot_group))
 
 
 def virtual_other_in_session(s: Storage) -> Storage:
@@ -11,12 +11,14 @@ import uproot.queues as q
 import uproot.storage as s
 import uproot.types as t
 from uproot.services import player_service as ps
+from uproot.services import session_service
 
 QUEUES: dict[tuple[str, ...], q.QueueType] = {}
 
 
 def setup_module():
     d.DATABASE.reset()
+    session_service.forget_sessions()
     q.Q.clear()
     QUEUES.clear()
     e.ADMINCHAT.clear()
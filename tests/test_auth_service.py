@@ -2,17 +2,19 @@ import hashlib
 
 import pytest
 from fastapi import HTTPException
+from itsdangerous import URLSafeTimedSerializer
 
 import uproot as u
 import uproot.core as c
 import uproot.deployment as d
 import uproot.storage as s
-from uproot.services import auth
+from uproot.services import auth, session_service
 
 
 @pytest.fixture
 def clean_auth(monkeypatch):
     d.DATABASE.reset()
+    session_service.forget_sessions()
     monkeypatch.setattr(u, "KEY", "test-auth-key")
     monkeypatch.setattr(d, "ADMINS", {"admin": ...}, raising=False)
     monkeypatch.setattr(auth, "ADMINS", {})
@@ -26,6 +28,8 @@ def clean_auth(monkeypatch):
     yield
 
     auth.POW_USED.clear()
+    # Tokens signed with the test key would be invalid for later modules
+    auth.store_active_tokens(set())
 
 
 def test_auth_token_lifecycle_requires_active_token(clean_auth):
@@ -40,11 +44,55 @@ def test_auth_token_lifecycle_requires_active_token(clean_auth):
     assert auth.verify_auth_token("admin", token) is None
 
 
+def test_auth_token_signature_is_verified_once(clean_auth, monkeypatch):
+    token = auth.create_auth_token_for_user("admin")
+    assert auth.verify_auth_token("admin", token) == "admin"
+
+    def unexpected_serializer():
+        raise AssertionError("token signature checked again")
+
+    monkeypatch.setattr(auth, "get_serializer", unexpected_serializer)
+    assert auth.from_cookie(token) == {"user": "admin", "token": token}
+
+    signed_at = auth.VERIFIED_TOKENS[token][2]
+    monkeypatch.setattr(auth.time, "time", lambda: signed_at + auth.TOKEN_MAX_AGE + 1)
+    assert auth.verify_auth_token("admin", token) is None
+    assert token not in auth.VERIFIED_TOKENS
+
+
+def test_expired_tokens_are_rejected_until_swept(clean_auth):
+    token = auth.create_auth_token_for_user("admin")
+    auth.store_active_tokens({token, "forged"})
+
+    assert auth.from_cookie("forged") == {"user": "", "token": ""}
+    assert auth.get_active_tokens() == {token, "forged"}
+
+    auth.cleanup_expired_tokens()
+
+    assert auth.get_active_tokens() == {token}
+
+
+def test_revoke_all_counts_unswept_invalid_tokens(clean_auth):
+    token = auth.create_auth_token_for_user("admin")
+    auth.store_active_tokens({token, "forged"})
+
+    assert auth.revoke_all_user_tokens("admin") == 2
+    assert auth.get_active_tokens() == set()
+
+
+def test_serializer_signs_like_plain_itsdangerous():
+    plain = URLSafeTimedSerializer("secret")
+    serializer = auth.serializer_for("secret")
+
+    assert serializer.loads(plain.dumps({"user": "admin"})) == {"user": "admin"}
+    assert plain.loads(serializer.dumps({"user": "admin"})) == {"user": "admin"}
+
+
 def test_auth_token_creation_rejects_unknown_user(clean_auth):
     assert auth.create_auth_token_for_user("missing") is None
 
 
-def test_bearer_token_validation_uses_exact_bearer_scheme(monkeypatch):
+async def test_bearer_token_validation_uses_exact_bearer_scheme(monkeypatch):
     monkeypatch.setattr(d, "API_KEYS", ["secret"])
 
     assert auth.verify_bearer_token("Bearer secret") is True
@@ -53,7 +101,7 @@ def test_bearer_token_validation_uses_exact_bearer_scheme(monkeypatch):
     assert auth.verify_bearer_token(None) is False
 
     with pytest.raises(HTTPException) as excinfo:
-        auth.require_bearer_token("Bearer wrong")
+        await auth.require_bearer_token("Bearer wrong")
 
     assert excinfo.value.status_code == 401
 
@@ -1,16 +1,38 @@
-from contextlib import asynccontextmanager
-
 import httpx
 
 from uproot.services import config_service
 
 
 async def test_praise_returns_fallback_on_network_error(monkeypatch):
-    @asynccontextmanager
-    async def raising_client():
+    def offline(request):
         raise httpx.ConnectError("offline")
-        yield
 
-    monkeypatch.setattr(config_service.httpx, "AsyncClient", raising_client)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(offline))
+    monkeypatch.setattr(config_service, "HTTP_CLIENT", client)
 
     assert await config_service.praise() == "We couldn't load praise right now."
+    assert config_service.http_client() is client
+
+    await config_service.close_http_client()
+
+    assert client.is_closed
+    assert config_service.HTTP_CLIENT is None
+
+
+def test_configs_are_cached_until_cleared(monkeypatch):
+    monkeypatch.setattr(config_service.u, "CONFIGS", {"first": ["a", "b"]})
+    config_service.configs.cache_clear()
+
+    before = config_service.configs()
+    config_service.u.CONFIGS["second"] = ["c"]
+
+    assert config_service.configs() is before
+    assert "second" not in before["configs"]
+
+    config_service.configs.cache_clear()
+
+    assert dict(config_service.configs()["configs"]) == {
+        "first": "a → b",
+        "second": "c",
+    }
+    config_service.configs.cache_clear()
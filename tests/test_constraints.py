@@ -1,6 +1,6 @@
 import pytest
 
-from uproot.constraints import ensure
+from uproot.constraints import ensure, valid_token
 
 
 def test_ensure_true_condition():
@@ -48,3 +48,12 @@ def test_ensure_with_falsy_values():
 
     with pytest.raises(ValueError):
         ensure({})
+
+
+def test_valid_token():
+    assert valid_token("")
+    assert valid_token("Room-1.a_b")
+    assert not valid_token("room 1")
+    assert not valid_token("room\n")
+    assert not valid_token("räum")
+    assert not valid_token(None)
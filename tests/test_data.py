@@ -1,17 +1,24 @@
 import random
 from datetime import date, datetime, time
 from io import BytesIO
+from itertools import pairwise
 from unittest.mock import patch
+from uuid import uuid4
 from zipfile import ZipFile
 
 import orjson as json
 import pytest
 from sortedcontainers import SortedList
 
+import uproot as u
+import uproot.core as c
+import uproot.deployment as d
+import uproot.storage as s
 from uproot.data import (
     DATA_DICTIONARY,
     briefcase_out,
     csv_out,
+    csv_stream,
     json2csv,
     jsonl_line,
     jsonl_out,
@@ -403,7 +410,7 @@ def test_grouped_format_name():
     assert data_service.grouped_format_name(["!!!"]) == "latest_grouped"
 
 
-def test_generate_briefcase(monkeypatch):
+async def test_generate_briefcase(monkeypatch):
     session_data = {
         ("player", "session1", "p1", "choice"): [Value(1.0, False, "A", "")],
         ("session", "session1", "players"): [Value(2.0, False, ["p1"], "")],
@@ -430,7 +437,7 @@ def test_generate_briefcase(monkeypatch):
         ],
     )
 
-    briefcase = data_service.generate_briefcase("session1", [], False)
+    briefcase = await data_service.generate_briefcase("session1", [], False)
 
     with ZipFile(BytesIO(briefcase)) as zf:
         assert sorted(zf.namelist()) == [
@@ -459,7 +466,34 @@ def test_generate_briefcase(monkeypatch):
     assert "myapp/MyPage" in page_times_csv
 
 
-def test_generate_briefcase_grouped(monkeypatch):
+def test_page_times_rows_use_page_order_in_effect():
+    d.DATABASE.reset()
+    session_service.forget_sessions()
+    u.CONFIGS["test-times"] = []
+
+    with s.Admin() as admin:
+        c.create_admin(admin)
+        sid = c.create_session(admin, "test-times", sname=f"times-{uuid4().hex[:8]}")
+
+    with s.Session(sid) as session:
+        pid = c.create_player(session)
+
+    for page_order, show_pages in ((["A", "B"], (0, 1, 2)), (["C"], (0,))):
+        with s.Player(*pid) as player:
+            player.page_order = page_order
+
+        for show_page in show_pages:
+            with s.Player(*pid) as player:
+                player.show_page = show_page
+
+    rows = data_service.page_times_rows(sid.sname)
+
+    assert [row["page_name"] for row in rows][-4:] == ["A", "B", "(End)", "C"]
+    assert all(row["left"] == nxt["entered"] for row, nxt in pairwise(rows))
+    assert rows[-1]["left"] is None
+
+
+async def test_generate_briefcase_grouped(monkeypatch):
     session_data = {
         ("player", "session1", "p1", "round"): [Value(1.0, False, 1, "")],
         ("player", "session1", "p1", "choice"): [Value(2.0, False, "A", "")],
@@ -472,7 +506,9 @@ def test_generate_briefcase_grouped(monkeypatch):
     )
     monkeypatch.setattr(data_service, "page_times_rows", lambda sname: [])
 
-    briefcase = data_service.generate_briefcase("session1", ["round"], False, "jsonl")
+    briefcase = await data_service.generate_briefcase(
+        "session1", ["round"], False, "jsonl"
+    )
 
     with ZipFile(BytesIO(briefcase)) as zf:
         assert sorted(zf.namelist()) == [
@@ -585,9 +621,19 @@ def test_is_custom_data_export_rejects_non_row_values():
     assert not data_service.is_custom_data_export([{1: "bad"}])
 
 
-def test_generate_custom_csv():
-    result = data_service.generate_custom_csv([{"a": "x", "b": 2}])
-    assert result == "a,b\r\nx,2\r\n"
+async def test_csv_stream_matches_csv_out():
+    rows = [{"a": i, "b": str(i)} for i in range(5)] + [{"c": True}]
+    chunks = [chunk async for chunk in csv_stream(rows, chunk=2)]
+
+    assert len(chunks) == 3
+    assert "".join(chunks) == csv_out(rows)
+    assert [chunk async for chunk in csv_stream([])] == [csv_out([])]
+
+
+async def test_generate_custom_csv():
+    rows = [{"a": "x", "b": 2}]
+    chunks = [chunk async for chunk in data_service.generate_custom_csv(rows)]
+    assert chunks == ["a,b\r\nx,2\r\n"]
 
 
 async def test_generate_custom_jsonl():
@@ -596,6 +642,18 @@ async def test_generate_custom_jsonl():
     assert chunks == ['{"a":"x","b":2}\n']
 
 
+def test_data_display():
+    class Label(str):
+        def __str__(self):
+            return "label"
+
+    assert data_service.data_display("text") == "text"
+    assert data_service.data_display(Label("x")) == "label"
+    assert data_service.data_display(b"\x00") == "[Binary]"
+    assert data_service.data_display(bytearray(2)) == "[Binary]"
+    assert data_service.data_display([1, None]) == "[1, None]"
+
+
 def test_pipeline_result_display():
     assert data_service.pipeline_result_display("hello") == "hello"
     assert data_service.pipeline_result_display({"a": 1}) == '{"a":1}'
@@ -20,9 +20,11 @@ import uproot.deployment as d  # noqa: E402
 import uproot.models as mod  # noqa: E402
 import uproot.storage as s  # noqa: E402
 import uproot.types as t  # noqa: E402
+from uproot.services import session_service  # noqa: E402
 
 # Reset database for tests
 d.DATABASE.reset()
+session_service.forget_sessions()
 u.CONFIGS["test"] = []
 
 
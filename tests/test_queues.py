@@ -27,6 +27,29 @@ def test_enqueue_fans_out_to_every_consumer():
     assert second.get_nowait()[1] == {"event": "Queued"}
 
 
+def test_enqueue_many_shares_one_entry_across_paths():
+    first = q.register(("session", "first"))
+    second = q.register(("session", "second"))
+
+    result = q.enqueue_many(
+        [("session", "first"), ("session", "second"), ("session", "absent")],
+        {"event": "Queued"},
+    )
+
+    first_u, first_entry = first.get_nowait()
+    second_u, second_entry = second.get_nowait()
+
+    assert first_entry == {"event": "Queued"}
+    assert first_entry is second_entry
+    assert first_u != second_u
+    assert [path for path, _ in result] == [
+        ("session", "first"),
+        ("session", "second"),
+        ("session", "absent"),
+    ]
+    assert ("session", "absent") not in q.Q
+
+
 def test_deregister_keeps_other_consumers_attached():
     path = ("session", "player")
     first = q.register(path)
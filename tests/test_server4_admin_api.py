@@ -1,18 +1,23 @@
+from types import SimpleNamespace
 from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException
+from pydantic import ValidationError
 
 import uproot as u
+import uproot.admin as a
 import uproot.core as c
 import uproot.deployment as d
 import uproot.server4 as api
 import uproot.services.auth as auth
 import uproot.storage as s
+from uproot.services import session_service
 
 
 def reset_admin_state() -> None:
     d.DATABASE.reset()
+    session_service.forget_sessions()
     u.CONFIGS["test-api"] = []
     u.CONFIGS_EXTRA["test-api"] = {"settings": {}}
 
@@ -77,6 +82,216 @@ async def test_create_session_accepts_zero_players_like_the_admin_ui() -> None:
     assert detail["players"] == []
 
 
+async def test_session_list_summarizes_session_fields() -> None:
+    reset_admin_state()
+    sname = f"api-list-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=2, sname=sname),
+        None,
+    )
+
+    with s.Session(sname) as session:
+        session.description = "Pilot"
+
+    summary = (await api.list_sessions(None))[sname]
+
+    assert summary["sname"] == sname
+    assert summary["config"] == "test-api"
+    assert summary["description"] == "Pilot"
+    assert summary["active"] is True
+    assert summary["room"] is None
+    assert summary["n_players"] == 2
+    assert summary["n_groups"] == 0
+    assert isinstance(summary["created"], float)
+
+
+async def test_known_sessions_skip_the_admin_lookup(monkeypatch) -> None:
+    reset_admin_state()
+    sname = f"api-known-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=0, sname=sname),
+        None,
+    )
+    a.session_exists(sname)
+
+    assert sname in session_service.KNOWN_SESSIONS
+
+    def no_admin():
+        raise AssertionError("admin storage should not be read")
+
+    with monkeypatch.context() as mp:
+        mp.setattr(session_service.s, "Admin", no_admin)
+        a.session_exists(sname)
+
+    with pytest.raises(HTTPException) as excinfo:
+        a.session_exists("nosuchsession")
+
+    assert excinfo.value.status_code == 400
+
+    with pytest.raises(ValueError, match="Invalid session"):
+        a.session_exists("nosuchsession", raise_http=False)
+
+    assert "nosuchsession" not in session_service.KNOWN_SESSIONS
+
+    a.forget_sessions()
+
+    assert session_service.KNOWN_SESSIONS == set()
+
+
+async def test_digest_and_pipeline_apps_follow_session_apps(monkeypatch) -> None:
+    reset_admin_state()
+    sname = f"api-apps-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=1, sname=sname),
+        None,
+    )
+
+    with s.Session(sname) as session:
+        session.apps = ["plain", "digested", "piped"]
+
+    monkeypatch.setattr(
+        u,
+        "APPS",
+        {
+            "plain": SimpleNamespace(),
+            "digested": SimpleNamespace(digest=object()),
+            "piped": SimpleNamespace(pipeline=object()),
+        },
+        raising=False,
+    )
+
+    assert a.get_digest(sname) == ["digested"]
+    assert (await api.list_session_pipelines(sname, None))["apps"] == ["piped"]
+
+
+def test_player_bodies_drop_duplicate_unames() -> None:
+    body = api.PlayerMessage(unames=["b", "a", "b", "a"], message="hi")
+
+    assert body.unames == ["b", "a"]
+
+
+def test_player_redirect_requires_http_url() -> None:
+    body = api.PlayerRedirect(unames=["a"], url="https://example.com")
+
+    assert body.url == "https://example.com"
+
+    with pytest.raises(ValidationError):
+        api.PlayerRedirect(unames=["a"], url="javascript:alert(1)")
+
+
+async def test_session_toggles_report_new_state() -> None:
+    reset_admin_state()
+    sname = f"api-toggle-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=0, sname=sname),
+        None,
+    )
+
+    assert await api.toggle_session_active(sname, None) == {"active": False}
+    assert await api.toggle_session_active(sname, None) == {"active": True}
+    assert await api.toggle_session_testing(sname, None) == {"testing": True}
+    assert await api.initialize_session(sname, None) == {"initialized": True}
+
+
+async def test_session_data_is_not_modified_without_new_writes() -> None:
+    reset_admin_state()
+    sname = f"api-data-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=1, sname=sname),
+        None,
+    )
+
+    first = await api.get_session_data(sname, 0.0, None)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await api.get_session_data(sname, first["last_update"], None)
+
+    assert excinfo.value.status_code == 304
+
+    with s.Session(sname) as session:
+        pid = session._uproot_players[0]
+
+    with s.Player(*pid) as player:
+        player.label = "changed"
+
+    second = await api.get_session_data(sname, first["last_update"], None)
+
+    assert second["last_update"] > first["last_update"]
+    assert second["data"][pid.uname]["label"][-1][3] == "changed"
+
+
+async def test_player_fields_read_latest_values() -> None:
+    reset_admin_state()
+    sname = f"api-fields-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=1, sname=sname),
+        None,
+    )
+
+    with s.Session(sname) as session:
+        pid = session._uproot_players[0]
+
+    with s.Player(*pid) as player:
+        player.label = "first"
+        player.label = "second"
+        player.scratch = [1]
+        del player.scratch
+
+    fields = await api.list_players(sname, ["label", "scratch", "missing"], None)
+
+    assert fields == {pid.uname: {"label": "second", "scratch": None, "missing": None}}
+
+
+async def test_player_moves_stay_within_page_order() -> None:
+    reset_admin_state()
+    sname = f"api-moves-{uuid4().hex[:8]}"
+
+    await api.create_session(
+        api.SessionCreate(config="test-api", n_players=1, sname=sname),
+        None,
+    )
+
+    with s.Session(sname) as session:
+        pid = session._uproot_players[0]
+
+    with s.Player(*pid) as player:
+        player.page_order = ["A", "B"]
+        player.show_page = 0
+
+    body = api.PlayersAction(unames=[pid.uname])
+
+    def show_page() -> int:
+        return s.Player(*pid).show_page
+
+    await api.advance_players(sname, body, None)
+    assert show_page() == 1
+
+    await api.put_players_to_end(sname, body, None)
+    assert show_page() == 2
+
+    await api.advance_players(sname, body, None)
+    assert show_page() == 2
+
+    await api.revert_players(sname, body, None)
+    await api.revert_players(sname, body, None)
+    await api.revert_players(sname, body, None)
+    await api.revert_players(sname, body, None)
+    assert show_page() == -1
+
+    unknown = api.PlayersAction(unames=[pid.uname, "nosuchplayer"])
+
+    with pytest.raises(ValueError, match="nosuchplayer"):
+        await api.advance_players(sname, unknown, None)
+
+    assert show_page() == -1
+
+
 async def test_room_patch_preserves_omitted_fields() -> None:
     reset_admin_state()
     roomname = f"api-room-{uuid4().hex[:8]}"
@@ -99,6 +314,43 @@ async def test_room_patch_preserves_omitted_fields() -> None:
     assert detail["labels"] == ["alpha"]
 
 
+async def test_room_session_assigns_labels_in_order() -> None:
+    reset_admin_state()
+    roomname = f"api-room-{uuid4().hex[:8]}"
+
+    await api.create_room(api.RoomCreate(name=roomname, config="test-api"), None)
+
+    created = await api.create_session_in_room(
+        roomname,
+        api.RoomSessionCreate(
+            config="test-api",
+            n_players=3,
+            assignees=["alpha", "beta"],
+            no_grow=True,
+        ),
+        None,
+    )
+
+    with s.Session(created["sname"]) as session:
+        labels = [s.Player(*pid).label for pid in session._uproot_players]
+
+    assert created["roomname"] == roomname
+    assert labels == ["alpha", "beta", ""]
+
+    with s.Admin() as admin:
+        assert admin.rooms[roomname]["sname"] == created["sname"]
+        assert admin.rooms[roomname]["capacity"] == 3
+
+    with pytest.raises(HTTPException) as excinfo:
+        await api.create_session_in_room(
+            roomname,
+            api.RoomSessionCreate(config="test-api", n_players=1),
+            None,
+        )
+
+    assert excinfo.value.status_code == 400
+
+
 async def test_data_export_matches_admin_ui_filetype_switch() -> None:
     reset_admin_state()
     sname = f"api-export-{uuid4().hex[:8]}"
@@ -1,7 +1,19 @@
+import base64
 import random
+from collections import namedtuple
 
+import pytest
+
+import uproot.queues as q
 import uproot.types as t
-from uproot.smithereens import data_uri, rng
+from uproot.smithereens import (
+    bracket_groups,
+    combine,
+    data_uri,
+    marker_span,
+    rng,
+    send_to,
+)
 from uproot.stable import decode, encode
 
 
@@ -39,7 +51,84 @@ def test_rng_is_in_star_imports():
     assert namespace["rng"] is rng
 
 
+def test_send_to_shares_one_entry_across_recipients():
+    q.Q.clear()
+    first = q.register(("send", "first"))
+    second = q.register(("send", "second"))
+
+    send_to(
+        [t.PlayerIdentifier("send", "first"), t.PlayerIdentifier("send", "second")],
+        {"x": 1},
+        "Ping",
+    )
+
+    first_entry = first.get_nowait()[1]
+
+    assert first_entry == {
+        "source": "send_to",
+        "constraint": None,
+        "data": {"x": 1},
+        "event": "Ping",
+    }
+    assert second.get_nowait()[1] is first_entry
+
+    q.Q.clear()
+
+
+def test_marker_span_matches_nested_markers():
+    page_order = ["A", "#RandomStart", "B", "#RandomStart", "C", "#RandomEnd"]
+    page_order += ["#RandomEnd", "D"]
+
+    assert marker_span(page_order, 2, "#RandomStart", "#RandomEnd") == (1, 6)
+    assert marker_span(page_order, 3, "#RandomStart", "#RandomEnd") == (3, 5)
+
+    with pytest.raises(RuntimeError, match="Could not find #RandomStart"):
+        marker_span(page_order, 0, "#RandomStart", "#RandomEnd")
+
+    with pytest.raises(RuntimeError, match="Could not find matching #RandomEnd"):
+        marker_span(page_order[:6], 2, "#RandomStart", "#RandomEnd")
+
+
+def test_bracket_groups_keep_nested_brackets_together():
+    pages = ["A", "#{", "B", "#{", "C", "#}", "#}", "D"]
+
+    assert bracket_groups(pages) == [
+        ["A"],
+        ["#{", "B", "#{", "C", "#}", "#}"],
+        ["D"],
+    ]
+    assert bracket_groups([]) == []
+
+    with pytest.raises(RuntimeError, match="Unmatched opening bracket"):
+        bracket_groups(["#{", "A"])
+
+    with pytest.raises(RuntimeError, match="Unmatched closing bracket"):
+        bracket_groups(["A", "#}"])
+
+
+def test_combine_reuses_tuple_types():
+    Pair = namedtuple("Pair", ["name", "value"])
+    Triple = namedtuple("Triple", ["name", "low", "high"])
+
+    first = combine([Pair("a", 1), Pair("b", 2)])
+    second = combine([Pair("a", 3), Pair("b", 4)])
+    ranges = combine([Triple("a", 1, 2), Triple("b", 3, 4)])
+
+    assert (first.a, first.b) == (1, 2)
+    assert type(first) is type(second)
+    assert (ranges.b.low, ranges.b.high) == (3, 4)
+    assert combine([]) == ()
+
+
 def test_data_uri_detects_mp4_by_ftyp_box():
     payload = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00"
 
     assert data_uri(payload).startswith("data:video/mp4;base64,")
+
+
+def test_data_uri_encodes_payload_without_newline():
+    payload = b"GIF89a" + bytes(range(256)) * 4
+
+    assert data_uri(payload) == "data:image/gif;base64," + base64.b64encode(
+        payload
+    ).decode("ascii")
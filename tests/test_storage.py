@@ -6,8 +6,10 @@ import uproot.core as c
 import uproot.deployment as d
 import uproot.storage as s
 import uproot.types as t
+from uproot.services import session_service
 
 d.DATABASE.reset()
+session_service.forget_sessions()
 u.CONFIGS["test"] = []
 
 with s.Admin() as admin:
@@ -3,6 +3,7 @@ import uproot.core as c
 import uproot.deployment as d
 import uproot.storage as s
 import uproot.types as t
+from uproot.services import session_service
 
 
 def expect_attribute_error(within_obj, field_name):
@@ -16,6 +17,7 @@ def expect_attribute_error(within_obj, field_name):
 
 def setup():
     d.DATABASE.reset()
+    session_service.forget_sessions()
     u.CONFIGS["test"] = []
 
     with s.Admin() as admin:
@@ -1097,3 +1099,19 @@ def test_storage_repr():
 
     player = s.Player("test", "user")
     assert repr(player) == "Player(*('test', 'user'))"
+
+
+def test_others_in_session_and_group():
+    sid, pid = setup()
+
+    with t.materialize(sid) as session:
+        other = c.create_player(session)
+        third = c.create_player(session)
+        c.create_group(session, [pid, other])
+
+    player = t.materialize(pid)
+
+    assert [t.identify(p) for p in player.others_in_session] == [other, third]
+    assert [t.identify(p) for p in player.others_in_group] == [other]
+    assert t.identify(player.other_in_group) == other
+    expect_attribute_error(t.materialize(third), "others_in_group")
@@ -22,6 +22,7 @@ import uproot.core as c
 import uproot.deployment as d
 import uproot.storage as s
 import uproot.types as t
+from uproot.services import session_service
 
 # Define type categories for testing
 IMMUTABLE_TYPES = (
@@ -42,6 +43,7 @@ MUTABLE_TYPES = (list, dict, set, bytearray)
 def setup_fresh_database():
     """Setup a completely fresh database state for testing."""
     d.DATABASE.reset()
+    session_service.forget_sessions()
     u.CONFIGS["test"] = []
 
     # Force reload of in-memory database
@@ -12,12 +12,14 @@ import uproot.deployment as d  # noqa: E402
 import uproot.queues as q  # noqa: E402
 import uproot.storage as s  # noqa: E402
 from uproot.jobs import try_group  # noqa: E402
+from uproot.services import session_service  # noqa: E402
 from uproot.types import GroupCreatingWait, SynchronizingWait  # noqa: E402
 
 
 @pytest.fixture
 def session_with_two_players():
     d.DATABASE.reset()
+    session_service.forget_sessions()
     q.Q.clear()
     u.CONFIGS["test"] = []
 